@@ -21,6 +21,7 @@ from . import pool
 from . import revisions
 from . import sensor_calibration
 from . import uart
+from . import websocket_stream
 from . import wifi
 from . import board_wifi_rx
 from . import board_wifi_tx
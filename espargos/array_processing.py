@@ -27,7 +27,7 @@ def music_spectrum(covariance, steering_vectors, source_count=1):
     eigenvalues, eigenvectors = np.linalg.eig(covariance)
     order = np.argsort(eigenvalues)[::-1]
     noise_subspace = eigenvectors[:, order][:, int(source_count) :]
-    spectrum = 1 / np.linalg.norm(np.einsum("ae,a...->e...", noise_subspace, np.conj(steering)), axis=0)
+    spectrum = 1 / np.linalg.norm(np.einsum("ae,a...->e...", noise_subspace, np.conj(steering), optimize=True), axis=0)
     return spectrum - np.min(spectrum) + 1e-6
 
 
@@ -38,6 +38,6 @@ def mvdr_spectrum(covariance, steering_vectors, diagonal_loading=0.1):
     covariance = (covariance + np.conj(covariance.T)) / 2
     loading = float(diagonal_loading) * np.trace(covariance) / covariance.shape[0]
     covariance_inv = np.linalg.pinv(covariance + loading * np.eye(covariance.shape[0]))
-    denominator = np.einsum("a...,ab,b...->...", np.conj(steering), covariance_inv, steering)
+    denominator = np.einsum("a...,ab,b...->...", np.conj(steering), covariance_inv, steering, optimize=True)
     spectrum = 1.0 / np.maximum(np.real(denominator), 1e-12)
     return spectrum - np.min(spectrum) + 1e-6
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import websockets.sync.client
 import http.client
 import threading
 import logging
@@ -14,6 +13,7 @@ from typing import Any, Callable
 from . import revisions
 from . import sensor
 from . import uart
+from . import websocket_stream
 
 __all__ = [
     "Board",
@@ -82,6 +82,76 @@ STREAM_MAGIC = bytes([0xE5, 0xA7, 0x60, 0x00])
 # Only this major API version is supported
 SUPPORTED_API_MAJOR = 3
 
+# Timeout and number of idle keep-alive connections kept per controller for HTTP API requests
+HTTP_TIMEOUT = 5
+HTTP_MAX_IDLE_CONNECTIONS_PER_HOST = 4
+
+
+class _HTTPConnectionPool:
+    """Process-wide pool of keep-alive HTTP connections to ESPARGOS controllers.
+
+    All boards share this pool, so successive API requests to the same
+    controller reuse an idle connection instead of paying a TCP handshake each
+    time. The controller may close idle connections at any time, so a GET
+    request on a reused connection that fails before a response arrives is
+    retried exactly once on a newly opened connection. Other requests such as
+    POST are never retried, since the controller may already have applied them.
+    """
+
+    def __init__(self, max_idle_per_host: int, timeout: float):
+        self._max_idle_per_host = max_idle_per_host
+        self._timeout = timeout
+        self._idle: dict[str, list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, host: str) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(host)
+            if idle:
+                return idle.pop(), True
+        return self._connect(host), False
+
+    def _connect(self, host: str) -> http.client.HTTPConnection:
+        return http.client.HTTPConnection(host, timeout=self._timeout)
+
+    def _release(self, host: str, conn: http.client.HTTPConnection):
+        with self._lock:
+            idle = self._idle.setdefault(host, [])
+            if len(idle) < self._max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _exchange(self, conn: http.client.HTTPConnection, method: str, path: str, body: str | bytes | None):
+        try:
+            conn.request(method, path, body)
+            res = conn.getresponse()
+            return res, res.read()
+        except BaseException:
+            conn.close()
+            raise
+
+    def request(self, host: str, method: str, path: str, body: str | bytes | None = None) -> tuple[int, bytes]:
+        """Perform one request and return the response status and body."""
+        conn, reused = self._acquire(host)
+        try:
+            res, payload = self._exchange(conn, method, path, body)
+        except (ConnectionError, http.client.BadStatusLine):
+            # A stale keep-alive connection: only idempotent GETs are safe to send again
+            if not reused or method != "GET":
+                raise
+            conn = self._connect(host)
+            res, payload = self._exchange(conn, method, path, body)
+
+        if res.will_close:
+            conn.close()
+        else:
+            self._release(host, conn)
+        return res.status, payload
+
+
+_http_pool = _HTTPConnectionPool(HTTP_MAX_IDLE_CONNECTIONS_PER_HOST, HTTP_TIMEOUT)
+
 
 class BoardControl:
     """Public, message-agnostic access to the controller request API."""
@@ -309,13 +379,9 @@ class Board(object):
 
         self.api_version = (api_major, api_minor)
 
-        self.revision = None
         device = api_info.get("device", "")
         revision_name = api_info.get("revision", "")
-        for rev in revisions._ALL_REVISIONS:
-            if (device, revision_name) == rev.identification:
-                self.revision = rev
-                break
+        self.revision = revisions._REVISIONS_BY_IDENTIFICATION.get((device, revision_name))
 
         if self.revision is None:
             raise EspargosUnexpectedResponseError(f"Unknown ESPARGOS revision: device={device!r}, revision={revision_name!r}")
@@ -328,7 +394,9 @@ class Board(object):
         self._stream_connected = False
         self._stream_lifecycle_lock = threading.Lock()
         self._sensor_message_reassembler = sensor.SensorMessageReassembler(logger=self._logger)
-        self._sensor_message_subscriptions: dict[int, list[SensorMessageSubscription]] = {}
+        # Subscriptions per type header are immutable tuples that are replaced on change,
+        # so the stream thread can dispatch with a single dict lookup and without locking
+        self._sensor_message_subscriptions: dict[int, tuple[SensorMessageSubscription, ...]] = {}
         self._sensor_message_subscriptions_lock = threading.Lock()
 
     @property
@@ -692,8 +760,7 @@ class Board(object):
             callback=callback,
         )
         with self._sensor_message_subscriptions_lock:
-            subscriptions = self._sensor_message_subscriptions.setdefault(type_header, [])
-            subscriptions.append(subscription)
+            self._sensor_message_subscriptions[type_header] = self._sensor_message_subscriptions.get(type_header, ()) + (subscription,)
         return subscription
 
     def unsubscribe_sensor_messages(self, subscription: SensorMessageSubscription) -> bool:
@@ -709,14 +776,13 @@ class Board(object):
         if not isinstance(subscription, SensorMessageSubscription):
             return False
         with self._sensor_message_subscriptions_lock:
-            subscriptions = self._sensor_message_subscriptions.get(subscription.type_header)
-            if subscriptions is None:
-                return False
-            try:
-                subscriptions.remove(subscription)
-            except ValueError:
+            subscriptions = self._sensor_message_subscriptions.get(subscription.type_header, ())
+            if subscription not in subscriptions:
                 return False
-            if not subscriptions:
+            remaining = tuple(entry for entry in subscriptions if entry is not subscription)
+            if remaining:
+                self._sensor_message_subscriptions[subscription.type_header] = remaining
+            else:
                 del self._sensor_message_subscriptions[subscription.type_header]
             return True
 
@@ -736,12 +802,7 @@ class Board(object):
                 self._logger.debug("Ignoring sensor message without a logical type header")
                 continue
 
-            with self._sensor_message_subscriptions_lock:
-                subscriptions = tuple(self._sensor_message_subscriptions.get(type_header, ()))
-            if not subscriptions:
-                continue
-
-            for subscription in subscriptions:
+            for subscription in self._sensor_message_subscriptions.get(type_header, ()):
                 try:
                     subscription.callback(message)
                 except Exception:
@@ -756,13 +817,18 @@ class Board(object):
                 break
 
     def _stream_loop_udp(self):
+        # All datagrams of the stream belong to a single UDP flow, which the kernel always
+        # delivers to one socket, so receive on one socket into one reused buffer instead
+        # of allocating a maximum-size datagram buffer per packet.
+        recv_buffer = bytearray(65535)
+        recv_view = memoryview(recv_buffer)
         self._udp_sock.settimeout(0.2)
         timeout_total = 0
         while self._stream_connected:
             try:
-                data, addr = self._udp_sock.recvfrom(65535)
+                size = self._udp_sock.recv_into(recv_buffer)
                 timeout_total = 0
-                self._stream_handle_message(data)
+                self._stream_handle_message(recv_view[:size])
             except socket.timeout:
                 timeout_total += 0.2
             except OSError as e:
@@ -776,11 +842,7 @@ class Board(object):
 
     def _stream_loop_websocket(self, path: str):
         try:
-            ws = websockets.sync.client.connect(
-                f"ws://{self.host}/{path}",
-                open_timeout=3,
-                close_timeout=0.5,
-            )
+            ws = websocket_stream.WebSocketStream(self.host, path, open_timeout=3)
         except Exception as e:
             self._stream_error = EspargosStreamConnectionError(f"Could not connect to sensor stream WebSocket on {self.host}: {e}")
             self._stream_ready_event.set()
@@ -814,25 +876,21 @@ class Board(object):
     def _fetch(self, path: str, data: str | bytes | None = None) -> str:
         method = "GET" if data is None else "POST"
         if self._uart_client is not None:
-            response = self._uart_client.request(method, path, data, timeout=5)
+            response = self._uart_client.request(method, path, data, timeout=HTTP_TIMEOUT)
             if response.status != 200:
                 raise EspargosHTTPStatusError(response.status, path, response.body_text())
             return response.body_text()
 
-        conn = http.client.HTTPConnection(self.host, timeout=5)
-        conn.request(method, "/" + path, data)
-
         try:
-            res = conn.getresponse()
+            status, body = _http_pool.request(self.host, method, "/" + path, data)
         except TimeoutError:
             self._logger.error(f"Timeout in HTTP request for {self.host}/{path}")
             raise TimeoutError
 
-        if res.status != 200:
-            body = res.read().decode("utf-8", errors="replace")
-            raise EspargosHTTPStatusError(res.status, path, body)
+        if status != 200:
+            raise EspargosHTTPStatusError(status, path, body.decode("utf-8", errors="replace"))
 
-        return res.read().decode("utf-8")
+        return body.decode("utf-8")
 
     def _handle_uart_log(self, message: str):
         self._logger.info(f"[device] {message.rstrip()}")
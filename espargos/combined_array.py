@@ -35,18 +35,33 @@ class AntennaOrientation(enum.Enum):
         self.stride_row = stride_row
         self.stride_col = stride_col
 
+        self._rotation_matrix = np.array(
+            [
+                [stride_row[0], stride_col[0]],
+                [stride_row[1], stride_col[1]],
+            ],
+            dtype=float,
+        )
+        self._rotation_matrix.flags.writeable = False
+
     def rotation_matrix(self):
         """
         Returns the 2x2 rotation matrix that maps from the board-local coordinate system
         to the combined array coordinate system. This is the same as the stride matrix.
+
+        The matrix is computed once per orientation and shared, so it is read-only.
         """
-        return np.array(
-            [
-                [self.stride_row[0], self.stride_col[0]],
-                [self.stride_row[1], self.stride_col[1]],
-            ],
-            dtype=float,
-        )
+        return self._rotation_matrix
+
+
+# Orientation lookup tables shared by all calls to build_jones_matrices
+_ORIENTATION_INDEX = {orientation: index for index, orientation in enumerate(AntennaOrientation)}
+_STRIDES_TO_ORIENTATION = {orientation.value: orientation for orientation in AntennaOrientation}
+_ROTATION_MATRICES = np.stack([orientation.rotation_matrix() for orientation in AntennaOrientation])
+
+# Inverse Jones matrix per orientation for the default base Jones matrix, which is a constant
+_DEFAULT_JONES_BY_ORIENTATION = np.linalg.inv(constants.ANTENNA_JONES_MATRIX) @ _ROTATION_MATRICES
+_DEFAULT_JONES_BY_ORIENTATION.flags.writeable = False
 
 
 def build_jones_matrices(antenna_orientations: np.ndarray, base_jones_matrix: np.ndarray = None):
@@ -79,20 +94,19 @@ def build_jones_matrices(antenna_orientations: np.ndarray, base_jones_matrix: np
     :return: Array of effective inverse Jones matrices with shape (rows, cols, 2, 2).
         Multiply with R/L feed vector to obtain global H/V: ``H_V = jones[r, c] @ R_L``.
     """
+    # There are only four orientations: use one matrix per orientation and gather them per antenna
     if base_jones_matrix is None:
-        base_jones_matrix = constants.ANTENNA_JONES_MATRIX
-
-    base_jones_inv = np.linalg.inv(base_jones_matrix)
+        jones_by_orientation = _DEFAULT_JONES_BY_ORIENTATION
+    else:
+        jones_by_orientation = np.linalg.inv(base_jones_matrix) @ _ROTATION_MATRICES
 
-    rows, cols = antenna_orientations.shape
-    jones_matrices = np.empty((rows, cols, 2, 2), dtype=base_jones_inv.dtype)
+    antenna_orientation_indices = np.fromiter(
+        (_ORIENTATION_INDEX[orientation] for orientation in antenna_orientations.flat),
+        dtype=np.intp,
+        count=antenna_orientations.size,
+    ).reshape(antenna_orientations.shape)
 
-    for r in range(rows):
-        for c in range(cols):
-            rot = antenna_orientations[r, c].rotation_matrix()
-            jones_matrices[r, c] = base_jones_inv @ rot
-
-    return jones_matrices
+    return jones_by_orientation[antenna_orientation_indices]
 
 
 def get_cable_wavelength(frequencies: np.ndarray, velocity_factors: np.ndarray):
@@ -179,21 +193,19 @@ def parse_combined_array_config(config_dict: dict):
             missing_refs = [f"{boardname}.{r}.{c}" for r, c in sorted(missing)]
             raise ValueError(f"Not all antennas from board '{boardname}' are used. Missing: {missing_refs}")
 
-        # Use antenna (0,0) as origin and compute strides from (1,0) and (0,1)
-        origin = np.array(positions[(0, 0)])
-        stride_board_row = np.array(positions[(1, 0)]) - origin
-        stride_board_col = np.array(positions[(0, 1)]) - origin
+        # Use antenna (0,0) as origin and compute strides from (1,0) and (0,1), in plain ints for enum matching
+        origin_row, origin_col = positions[(0, 0)]
+        stride_board_row = (positions[(1, 0)][0] - origin_row, positions[(1, 0)][1] - origin_col)
+        stride_board_col = (positions[(0, 1)][0] - origin_row, positions[(0, 1)][1] - origin_col)
 
-        # Match stride vectors to a known orientation (convert to plain int for enum matching)
-        stride_tuple = (tuple(int(x) for x in stride_board_row), tuple(int(x) for x in stride_board_col))
-        try:
-            orientation = AntennaOrientation(stride_tuple)
-        except ValueError:
-            raise ValueError(f"Board '{boardname}' has an invalid rotation (stride_row={stride_tuple[0]}, stride_col={stride_tuple[1]}). " f"Only 0°/90°/180°/270° rotations are supported, no flips.")
+        # Match stride vectors to a known orientation
+        orientation = _STRIDES_TO_ORIENTATION.get((stride_board_row, stride_board_col))
+        if orientation is None:
+            raise ValueError(f"Board '{boardname}' has an invalid rotation (stride_row={stride_board_row}, stride_col={stride_board_col}). " f"Only 0°/90°/180°/270° rotations are supported, no flips.")
 
         for (br, bc), (cr, cc) in positions.items():
-            expected_pos = origin + br * stride_board_row + bc * stride_board_col
-            if not np.array_equal(expected_pos, [cr, cc]):
+            expected_pos = (origin_row + br * stride_board_row[0] + bc * stride_board_col[0], origin_col + br * stride_board_row[1] + bc * stride_board_col[1])
+            if expected_pos != (cr, cc):
                 raise ValueError(f"Antennas of board '{boardname}' do not form a contiguous sub-array. " f"Antenna {boardname}.{br}.{bc} is at combined array position ({cr}, {cc}), " f"but expected ({expected_pos[0]}, {expected_pos[1]})")
 
         board_orientations[boardname] = orientation
@@ -201,12 +213,13 @@ def parse_combined_array_config(config_dict: dict):
     # Build the indexing matrix and antenna orientation array from the validated positions
     indexing_matrix = np.zeros((n_rows, n_cols), dtype=int)
     antenna_orientations = np.empty((n_rows, n_cols), dtype=object)
-    for boardname, positions in board_antenna_positions.items():
+    for board_index, (boardname, positions) in enumerate(board_antenna_positions.items()):
+        offset_board = board_index * constants.ANTENNAS_PER_BOARD
+        orientation = board_orientations[boardname]
         for (index_row, index_col), (row, col) in positions.items():
-            offset_board = list(board_names_hosts.keys()).index(boardname) * constants.ANTENNAS_PER_BOARD
             offset_row = index_row * constants.ANTENNAS_PER_ROW
             indexing_matrix[row, col] = offset_board + offset_row + index_col
-            antenna_orientations[row, col] = board_orientations[boardname]
+            antenna_orientations[row, col] = orientation
 
     # Get cable lengths and velocity factors
     cable_lengths = np.asarray([board["cable"]["length"] for board in config["boards"].values()])
@@ -233,13 +246,7 @@ def build_combined_array_data(indexing_matrix, input_data):
 
     :return: The combined array data. Complex-valued NumPy array with shape (datapoints, rows, columns, subcarriers).
     """
-    # input_data has shape (datapoint, board, row, column, subcarrier)
-    data_by_array_row_col = np.moveaxis(input_data, 0, -1)
-    data_by_antenna = np.reshape(
-        data_by_array_row_col,
-        (data_by_array_row_col.shape[0] * data_by_array_row_col.shape[1] * data_by_array_row_col.shape[2],) + data_by_array_row_col.shape[3:],
-    )
-    combined_data = data_by_antenna[indexing_matrix]
-    combined_data = np.moveaxis(combined_data, -1, 0)
-
-    return combined_data
+    # input_data has shape (datapoint, board, row, column, subcarrier). Merging (board, row, column) into
+    # one antenna axis is a view for contiguous input, so the antennas are gathered in a single copy.
+    data_by_antenna = np.reshape(input_data, (input_data.shape[0], input_data.shape[1] * input_data.shape[2] * input_data.shape[3]) + input_data.shape[4:])
+    return np.take(data_by_antenna, indexing_matrix, axis=1)
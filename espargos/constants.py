@@ -13,6 +13,7 @@ __all__ = [
     "ROWS_PER_BOARD",
     "RX_GAIN_DB_PER_UNIT",
     "SPEED_OF_LIGHT",
+    "SUBCARRIERS_PER_CHANNEL",
     "WIFI_CHANNEL1_FREQUENCY",
     "WIFI_CHANNEL_SPACING",
     "WIFI_SUBCARRIER_SPACING",
@@ -48,6 +49,9 @@ WIFI_CHANNEL_SPACING = 5e6
 WIFI_SUBCARRIER_SPACING = 312.5e3
 "Subcarrier spacing of WiFi (in Hz)"
 
+SUBCARRIERS_PER_CHANNEL = int(2 * WIFI_CHANNEL_SPACING / WIFI_SUBCARRIER_SPACING)
+"Subcarrier offset between the primary and secondary channel of a 40 MHz WiFi transmission"
+
 ANTENNA_JONES_MATRIX_SIMPLE = np.sqrt(2) / 2 * np.asarray([[-1, 1], [1, 1]])
 "Simple Jones matrix to convert from linear (H/V) to feed (R/L) polarization basis"
 
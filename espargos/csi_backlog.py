@@ -224,7 +224,8 @@ class CSIBacklog(SensorBacklog):
             calibration = self._pool.calibration
             if calibration is None:
                 raise RuntimeError("CSI calibration is enabled but the pool has no calibration")
-            csi = getattr(calibration, calibration_method)(csi)
+            # The freshly deserialized array is not shared, so calibrate it in place
+            getattr(calibration, calibration_method)(csi, out=csi)
         values[field] = csi
 
     def _on_new_csi(self, clustered_csi):
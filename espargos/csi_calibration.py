@@ -10,6 +10,9 @@ HT20, HT40, HE20) on their respective subcarrier grids. Because the stored
 model is format-independent, calibration measured with one preamble format
 applies to every other format on the same channel configuration, e.g.
 calibrating from L-LTF packets in 40 MHz mode and coherently receiving HT40.
+
+The ``apply_*`` methods also accept CuPy arrays, in which case calibration is
+applied on the GPU without copying the CSI data to the host.
 """
 
 import numpy as np
@@ -22,6 +25,18 @@ from .sensor_calibration import ClockReferenceScope, SensorCalibration, compute_
 
 __all__ = ["CSICalibration"]
 
+# CSI formats for which calibration vectors are synthesized
+CSI_FORMATS = ("lltf", "ht20", "ht40", "he20")
+
+
+def _aligned_copy(array: np.ndarray, alignment: int = 64) -> np.ndarray:
+    """Return a C-contiguous copy of ``array`` whose data starts on an ``alignment``-byte boundary."""
+    buffer = np.empty(array.nbytes + alignment, dtype=np.uint8)
+    offset = -buffer.ctypes.data % alignment
+    aligned = buffer[offset : offset + array.nbytes].view(array.dtype).reshape(array.shape)
+    aligned[...] = array
+    return aligned
+
 
 class CSICalibration(SensorCalibration):
     def __init__(
@@ -101,7 +116,29 @@ class CSICalibration(SensorCalibration):
         )
 
         self._logger = logging.getLogger("espargos.calib")
-        self._calibration_cache_by_format: dict[str, np.ndarray] = {}
+
+        # Calibration is immutable after construction, so synthesize the correction
+        # vectors of all formats once and keep apply_* a single multiplication.
+        # All formats share one synthesis pass over their concatenated frequency grids,
+        # and each format's vector is then stored contiguous and cache-line aligned.
+        format_frequencies = [self._format_frequencies(csi_format) for csi_format in CSI_FORMATS]
+        split_indices = np.cumsum([len(frequencies) for frequencies in format_frequencies])[:-1]
+        all_corrections = self.phase_time_correction(np.concatenate(format_frequencies))
+
+        # Any NaN offset or delay propagates into the corrections; scanning them as a flat
+        # real-valued view lets NumPy use its contiguous float isnan loop. Sensors without
+        # valid calibration are left uncorrected instead of turning their CSI into NaN.
+        uncalibrated_sensors = np.isnan(all_corrections.view(np.float32)).any(axis=-1)
+        if uncalibrated_sensors.any():
+            self._logger.warning(f"Calibration offsets contain NaN for {np.count_nonzero(uncalibrated_sensors)} sensor(s), missing calibration data? Leaving these sensors uncalibrated.")
+            all_corrections[uncalibrated_sensors] = 1.0
+
+        corrections = np.split(all_corrections, split_indices, axis=-1)
+        self._correction_by_format: dict[str, np.ndarray] = {csi_format: _aligned_copy(correction) for csi_format, correction in zip(CSI_FORMATS, corrections)}
+        # CSI arrives both as complex64 and complex128; keep the (small) corrections in
+        # both precisions so that apply_* never converts the calibration on the fly.
+        self._correction_by_format_complex128: dict[str, np.ndarray] = {csi_format: _aligned_copy(correction.astype(np.complex128)) for csi_format, correction in self._correction_by_format.items()}
+        self._device_correction_by_format = {}
 
     def _format_frequencies(self, csi_format: str) -> np.ndarray:
         if csi_format == "lltf":
@@ -115,51 +152,67 @@ class CSICalibration(SensorCalibration):
             return csi_processing.get_frequencies_ht40(self.channel_primary, channel_secondary)
         raise ValueError(f"Unknown CSI format {csi_format!r}")
 
-    def _apply(self, csi_format: str, values: np.ndarray) -> np.ndarray:
-        correction = self._calibration_cache_by_format.get(csi_format)
+    def _device_correction(self, csi_format: str):
+        """Return the correction vector of a format as a CuPy array, copying it to the GPU on first use."""
+        correction = self._device_correction_by_format.get(csi_format)
         if correction is None:
-            if np.isnan(self.timing_offsets).any() or np.isnan(self.phase_offsets).any():
-                self._logger.warning("Calibration offsets contain NaN, missing calibration data?")
-
-            correction = self.phase_time_correction(self._format_frequencies(csi_format))
-            self._calibration_cache_by_format[csi_format] = correction
-
-        return values * correction
-
-    def apply_lltf(self, values: np.ndarray) -> np.ndarray:
+            import cupy
+
+            correction = cupy.asarray(self._correction_by_format[csi_format])
+            self._device_correction_by_format[csi_format] = correction
+        return correction
+
+    def _apply(self, csi_format: str, values: np.ndarray, out: np.ndarray | None) -> np.ndarray:
+        if type(values).__module__.startswith("cupy"):
+            correction = self._device_correction(csi_format)
+        elif values.dtype == np.complex128:
+            correction = self._correction_by_format_complex128[csi_format]
+        else:
+            correction = self._correction_by_format[csi_format]
+        return np.multiply(values, correction, out=out)
+
+    def apply_lltf(self, values: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
         """
         Apply phase calibration to the provided L-LTF CSI data.
 
         :param values: The CSI data to which the phase calibration should be applied, as a complex-valued numpy array of shape :code:`(boardcount, constants.ROWS_PER_BOARD, constants.ANTENNAS_PER_ROW, csi_packet.LEGACY_COEFFICIENTS_PER_CHANNEL)`
+            Arrays with additional leading axes, e.g. a stack of datapoints, are calibrated in a single pass.
+        :param out: Optional array to store the result in, e.g. ``values`` itself to calibrate in place
         :return: The phase-calibrated CSI data
         """
-        return self._apply("lltf", values)
+        return self._apply("lltf", values, out)
 
-    def apply_ht20(self, values: np.ndarray) -> np.ndarray:
+    def apply_ht20(self, values: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
         """
         Apply phase calibration to the provided HT20 CSI data.
 
         :param values: The CSI data to which the phase calibration should be applied, as a complex-valued numpy array of shape :code:`(boardcount, constants.ROWS_PER_BOARD, constants.ANTENNAS_PER_ROW, csi_packet.HT_COEFFICIENTS_PER_CHANNEL)`
+            Arrays with additional leading axes, e.g. a stack of datapoints, are calibrated in a single pass.
+        :param out: Optional array to store the result in, e.g. ``values`` itself to calibrate in place
         :return: The phase-calibrated CSI data
         """
-        return self._apply("ht20", values)
+        return self._apply("ht20", values, out)
 
-    def apply_ht40(self, values: np.ndarray) -> np.ndarray:
+    def apply_ht40(self, values: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
         """
         Apply phase calibration to the provided HT40 CSI data.
 
         :param values: The CSI data to which the phase calibration should be applied, as a complex-valued numpy array of shape :code:`(boardcount, constants.ROWS_PER_BOARD, constants.ANTENNAS_PER_ROW, csi_packet.HT_COEFFICIENTS_PER_CHANNEL + csi_packet.HT40_GAP_SUBCARRIERS + csi_packet.HT_COEFFICIENTS_PER_CHANNEL)`
+            Arrays with additional leading axes, e.g. a stack of datapoints, are calibrated in a single pass.
+        :param out: Optional array to store the result in, e.g. ``values`` itself to calibrate in place
         :return: The phase-calibrated CSI data
         """
-        return self._apply("ht40", values)
+        return self._apply("ht40", values, out)
 
-    def apply_he20(self, values: np.ndarray) -> np.ndarray:
+    def apply_he20(self, values: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
         """
         Apply phase calibration to the provided HE20 CSI data.
 
         :param values: The CSI data to which the phase calibration should be
             applied, as a complex-valued numpy array of shape
             :code:`(boardcount, constants.ROWS_PER_BOARD, constants.ANTENNAS_PER_ROW, csi_packet.HE20_COEFFICIENTS_PER_CHANNEL)`
+            Arrays with additional leading axes, e.g. a stack of datapoints, are calibrated in a single pass.
+        :param out: Optional array to store the result in, e.g. ``values`` itself to calibrate in place
         :return: The phase-calibrated CSI data
         """
-        return self._apply("he20", values)
+        return self._apply("he20", values, out)
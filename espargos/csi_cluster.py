@@ -2,7 +2,6 @@
 
 """Store the CSI reported by multiple sensors for one Wi-Fi packet."""
 
-import binascii
 import time
 
 import numpy as np
@@ -24,6 +23,34 @@ _RAW_HT20_BYTES = csi_packet.HT_COEFFICIENTS_PER_CHANNEL * 2
 _RAW_HT40_BYTES = (csi_packet.HT_COEFFICIENTS_PER_CHANNEL * 2) + (csi_packet.HT40_GAP_SUBCARRIERS * 2) + (csi_packet.HT_COEFFICIENTS_PER_CHANNEL * 2)
 _RAW_HE20_BYTES = csi_packet.HE20_COEFFICIENTS_PER_CHANNEL * 2
 
+# Flags for the channel estimates a sensor provides, see CSICluster._get_csi_formats
+_CSI_FORMAT_LLTF = 1 << 0
+_CSI_FORMAT_HT20 = 1 << 1
+_CSI_FORMAT_HT40 = 1 << 2
+_CSI_FORMAT_HE20 = 1 << 3
+_CSI_FORMAT_ALL = _CSI_FORMAT_LLTF | _CSI_FORMAT_HT20 | _CSI_FORMAT_HT40 | _CSI_FORMAT_HE20
+
+# Relative secondary channel position, indexed by the "second" field of the RX control structure
+_SECONDARY_CHANNEL_RELATIVE = (0, 1, -1)
+
+
+def _sto_delay_correction(delay: np.ndarray, subcarrier_frequencies: np.ndarray) -> np.ndarray:
+    """
+    Compute the phasors that compensate the sampling time offset of every sensor.
+
+    The phase is evaluated in real arithmetic and the phasors are written directly
+    as single precision, matching the precision of the CSI they are applied to.
+
+    :param delay: Sensor sampling times of shape :code:`(boardcount, constants.ROWS_PER_BOARD, constants.ANTENNAS_PER_ROW)`, in seconds
+    :param subcarrier_frequencies: Baseband frequencies of the subcarriers, see :func:`.csi_processing.get_csi_sto_correction_frequencies`
+    :return: Complex64 array of shape :code:`delay.shape + subcarrier_frequencies.shape`
+    """
+    phase = -2 * np.pi * delay[..., np.newaxis] * subcarrier_frequencies
+    sto_delay_correction = np.empty(phase.shape, dtype=np.complex64)
+    np.cos(phase, out=sto_delay_correction.real)
+    np.sin(phase, out=sto_delay_correction.imag)
+    return sto_delay_correction
+
 
 class CSICluster(SensorCluster):
     """
@@ -55,23 +82,25 @@ class CSICluster(SensorCluster):
         self.frame_key = frame_key
         self.source_mac = frame_key.source_mac.hex()
         self.destination_mac = frame_key.destination_mac.hex()
-        self.sequence_control = wifi.SequenceControl(b"\x00\x00")
+        self.sequence_control = wifi.SequenceControl.from_buffer_copy(b"\x00\x00")
         self.sequence_control.seg = frame_key.sequence_number
         self.sequence_control.frag = frame_key.fragment_number
         self.retry = frame_key.retry
 
         self._host_timestamp = time.time()
         self._csi_packets = [[[None for _ in range(constants.ANTENNAS_PER_ROW)] for _ in range(constants.ROWS_PER_BOARD)] for _ in self.board_revisions]
+        # (board, row, column, packet) of all sensors that reported CSI, in order of arrival
+        self._complete_sensors = []
+        # Channel estimates provided by all of these sensors, as _CSI_FORMAT_* flags
+        self._available_csi_formats = _CSI_FORMAT_ALL
         self._radar_tx_report = None
         self._radar_tx_index = -1
 
-        # Allocate memory for the RSSI, gain, rf switch state and noise floor values
-        self._rssi = np.full(self.shape, fill_value=np.nan, dtype=np.float32)
-        self._rx_gain = np.full(self.shape, fill_value=np.nan, dtype=np.float32)
-        self._fft_gain = np.full(self.shape, fill_value=np.nan, dtype=np.float32)
+        # Allocate memory for the RSSI, gain, rf switch state and noise floor values.
+        # The floating point values share one allocation, each field is a contiguous view into it.
+        self._float_metadata = np.full((5,) + self.shape, fill_value=np.nan, dtype=np.float32)
+        self._rssi, self._rx_gain, self._fft_gain, self._noise_floor, self._cfo = self._float_metadata
         self._rf_switch_state = np.full(self.shape, fill_value=sensor.RFSwitchState.SENSOR_RFSWITCH_UNKNOWN, dtype=np.uint8)
-        self._noise_floor = np.full(self.shape, fill_value=np.nan, dtype=np.float32)
-        self._cfo = np.full(self.shape, fill_value=np.nan, dtype=np.float32)
         self._lltf_8bit_mode = np.full(self.shape, fill_value=False, dtype=np.bool_)
         self._gain_table_entry_raw = np.zeros(self.shape + (12,), dtype=np.uint8)
         self._gain_table_entry_valid = np.full(self.shape, fill_value=False)
@@ -100,7 +129,7 @@ class CSICluster(SensorCluster):
                 if self.retry:
                     return False
                 raise ClusterCollisionError(f"conflicting CSI from board {board_index}, row {row}, column {col}")
-            if np.any(self.completion) and self.is_radar != stream_packet.is_radar:
+            if self._completion_count > 0 and self.is_radar != stream_packet.is_radar:
                 raise ClusterCollisionError("radar and non-radar CSI use the same Wi-Fi frame key")
             if self.has_radar_tx_report and not stream_packet.is_radar:
                 raise ClusterCollisionError("non-radar CSI conflicts with an existing radar TX report")
@@ -114,7 +143,7 @@ class CSICluster(SensorCluster):
                 if bytes(existing_report) == bytes(stream_packet):
                     return False
                 raise ClusterCollisionError(f"conflicting radar TX report with tx_count={stream_packet.tx_count}")
-            if np.any(self.completion) and not self.is_radar:
+            if self._completion_count > 0 and not self.is_radar:
                 raise ClusterCollisionError("radar TX report conflicts with existing non-radar CSI")
             self._set_radar_tx_report(
                 stream_packet,
@@ -135,8 +164,8 @@ class CSICluster(SensorCluster):
         :param sensor_position: The logical ``(board, row, column)`` position
         :param serialized_csi: The serialized CSI data
         """
-        assert binascii.hexlify(bytearray(serialized_csi.source_mac)).decode("utf-8") == self.source_mac
-        assert binascii.hexlify(bytearray(serialized_csi.destination_mac)).decode("utf-8") == self.destination_mac
+        assert serialized_csi.source_mac == self.frame_key.source_mac
+        assert serialized_csi.destination_mac == self.frame_key.destination_mac
         assert serialized_csi.sequence_control.seg == self.sequence_control.seg
         assert serialized_csi.sequence_control.frag == self.sequence_control.frag
         assert serialized_csi.is_retry == self.retry
@@ -147,10 +176,12 @@ class CSICluster(SensorCluster):
 
         # Store CSI data to pre-allocated memory
         self._csi_packets[board_index][row][col] = serialized_csi
+        self._complete_sensors.append((board_index, row, col, serialized_csi))
+        self._available_csi_formats &= self._get_csi_formats(serialized_csi)
         # self.complex_csi_all[board_num, row, col] = csi_cplx # TODO: Will not work for V3 :(
 
         # Signed metadata fields are stored as unsigned due to ctypes packing limitations.
-        rx_ctrl = csi_packet.WiFiPacketRxControlV3(serialized_csi.rx_ctrl)
+        rx_ctrl = serialized_csi.rx_control
         self._rssi[board_index, row, col] = rx_ctrl.rssi_signed
         self._rx_gain[board_index, row, col] = rx_ctrl.rx_gain_signed
         self._fft_gain[board_index, row, col] = rx_ctrl.fft_gain_signed
@@ -170,8 +201,8 @@ class CSICluster(SensorCluster):
         """
         Attach radar transmit metadata for the Wi-Fi packet represented by this cluster.
         """
-        assert binascii.hexlify(bytearray(radar_tx_report.source_mac)).decode("utf-8") == self.source_mac
-        assert binascii.hexlify(bytearray(radar_tx_report.destination_mac)).decode("utf-8") == self.destination_mac
+        assert radar_tx_report.source_mac == self.frame_key.source_mac
+        assert radar_tx_report.destination_mac == self.frame_key.destination_mac
         assert radar_tx_report.sequence_control.seg == self.sequence_control.seg
         assert radar_tx_report.sequence_control.frag == self.sequence_control.frag
 
@@ -218,56 +249,66 @@ class CSICluster(SensorCluster):
 
         csi_lltf = np.zeros(self.shape + (csi_packet.LEGACY_COEFFICIENTS_PER_CHANNEL,), dtype=np.complex64)
 
+        # Uncompressed L-LTF is collected first and unpacked for all sensors at once
+        forced_positions, forced_buffers = [], []
+        native_positions, native_buffers = [], []
+        iq8_positions, iq8_buffers = [], []
+
         def deserialize_lltf_packet(b, r, a, serialized_csi):
             nonlocal csi_lltf
-            csi_lltf_sensor = csi_lltf[b, r, a, :].view()
-
             if serialized_csi.is_compressed:
-                csi_lltf_sensor[:] = csi_compression.decode_compressed_lltf(
+                csi_lltf[b, r, a, :] = csi_compression.decode_compressed_lltf(
                     serialized_csi.buf,
                     serialized_csi.acquire_force_lltf,
                     serialized_csi.acquire_lltf_8bit_mode,
                 )
-                return
-
-            if serialized_csi.acquire_lltf_8bit_mode:
-                csi_lltf_sensor[:] = serialized_csi._decode_lltf8()
-                csi_processing.interpolate_lltf_gap(csi_lltf_sensor)
+            elif serialized_csi.acquire_lltf_8bit_mode:
+                iq8_positions.append((b, r, a))
+                iq8_buffers.append(serialized_csi.buf[:_RAW_LLTF_BYTES])
             elif serialized_csi.acquire_force_lltf:
-                # In forced LLTF mode the ESP32-C61 reports 52 signed 12-bit values:
-                # 26 complex coefficients for every second subcarrier, including DC.
-                # The last active subcarrier is not measured and must be extrapolated.
-                lltf_all = serialized_csi._decode_lltf12(52)
-                csi_lltf_sensor[:-1:2] = lltf_all.astype(np.float32).view(np.complex64)
-                csi_lltf_sensor[-1] = 2 * csi_lltf_sensor[-3] - csi_lltf_sensor[-5]
+                forced_positions.append((b, r, a))
+                forced_buffers.append(serialized_csi.buf[: 52 * 2])
             else:
-                # Native 11g LLTF carries 26 complex coefficients for even-indexed
-                # subcarriers plus a final real-only sample for the last subcarrier.
-                lltf_all = serialized_csi._decode_lltf12(53)
-                even_coeffs = lltf_all[:52].astype(np.float32).view(np.complex64)
-                csi_lltf_sensor[0:52:2] = even_coeffs
-                csi_lltf_sensor[-1] = lltf_all[52].astype(np.float32) + 1.0j * csi_lltf_sensor[-3].imag
+                native_positions.append((b, r, a))
+                native_buffers.append(serialized_csi.buf[: 53 * 2])
 
-            # DC subcarrier. In sparse 12-bit LLTF this is only provided when
-            # force LLTF is true. 8-bit LLTF was handled above like HT20.
-            if not serialized_csi.acquire_force_lltf and not serialized_csi.acquire_lltf_8bit_mode:
-                dc_subcarrier_index = csi_packet.LEGACY_COEFFICIENTS_PER_CHANNEL // 2
-                csi_lltf_sensor[dc_subcarrier_index] = (csi_lltf_sensor[dc_subcarrier_index - 2] + csi_lltf_sensor[dc_subcarrier_index + 2]) / 2.0
+        self._foreach_complete_sensor(deserialize_lltf_packet)
 
-            # Interpolate to get full 53 subcarriers
-            if not serialized_csi.acquire_lltf_8bit_mode:
-                csi_lltf_sensor[1::2] = 0.5 * (csi_lltf_sensor[0:-1:2] + csi_lltf_sensor[2::2])
+        if iq8_positions:
+            csi_lltf_iq8 = csi_packet._unpack_iq8(b"".join(iq8_buffers), csi_packet.LEGACY_COEFFICIENTS_PER_CHANNEL)
+            csi_processing.interpolate_lltf_gap(csi_lltf_iq8)
+            csi_lltf[tuple(np.transpose(iq8_positions))] = csi_lltf_iq8
+
+        if forced_positions:
+            # In forced LLTF mode the ESP32-C61 reports 52 signed 12-bit values:
+            # 26 complex coefficients for every second subcarrier, including DC.
+            # The last active subcarrier is not measured and must be extrapolated.
+            lltf_all = csi_packet._unpack_lltf12(b"".join(forced_buffers), 52)
+            csi_lltf_forced = np.zeros((len(forced_positions), csi_packet.LEGACY_COEFFICIENTS_PER_CHANNEL), dtype=np.complex64)
+            csi_lltf_forced[:, :-1:2] = lltf_all.astype(np.float32).view(np.complex64)
+            csi_lltf_forced[:, -1] = 2 * csi_lltf_forced[:, -3] - csi_lltf_forced[:, -5]
+            csi_lltf[tuple(np.transpose(forced_positions))] = self._interpolate_sparse_lltf(csi_lltf_forced)
+
+        if native_positions:
+            # Native 11g LLTF carries 26 complex coefficients for even-indexed
+            # subcarriers plus a final real-only sample for the last subcarrier.
+            lltf_all = csi_packet._unpack_lltf12(b"".join(native_buffers), 53)
+            csi_lltf_native = np.zeros((len(native_positions), csi_packet.LEGACY_COEFFICIENTS_PER_CHANNEL), dtype=np.complex64)
+            csi_lltf_native[:, 0:52:2] = lltf_all[:, :52].astype(np.float32).view(np.complex64)
+            csi_lltf_native[:, -1] = lltf_all[:, 52].astype(np.float32) + 1.0j * csi_lltf_native[:, -3].imag
 
-        self._foreach_complete_sensor(deserialize_lltf_packet)
+            # DC subcarrier. In sparse 12-bit LLTF this is only provided when
+            # force LLTF is true. 8-bit LLTF was handled above like HT20.
+            dc_subcarrier_index = csi_packet.LEGACY_COEFFICIENTS_PER_CHANNEL // 2
+            csi_lltf_native[:, dc_subcarrier_index] = (csi_lltf_native[:, dc_subcarrier_index - 2] + csi_lltf_native[:, dc_subcarrier_index + 2]) / 2.0
+            csi_lltf[tuple(np.transpose(native_positions))] = self._interpolate_sparse_lltf(csi_lltf_native)
 
         # Need to take timestamps into account to provide phase coherence across all sensors
         delay = self.sensor_timestamps
-        subcarrier_range = csi_packet.get_csi_format_subcarrier_indices("lltf").astype(np.float64)[np.newaxis, np.newaxis, np.newaxis, :]
-
-        # Need to adjust range if using 40MHz wide channel since LO is either above or below the primary channel that L-LTF is on
-        subcarrier_range -= self.secondary_channel_relative * int(2 * constants.WIFI_CHANNEL_SPACING / constants.WIFI_SUBCARRIER_SPACING)
-        sto_delay_correction = np.exp(-1.0j * 2 * np.pi * delay[:, :, :, np.newaxis] * constants.WIFI_SUBCARRIER_SPACING * subcarrier_range)
-        csi_lltf = np.einsum("bras,bras->bras", csi_lltf, sto_delay_correction)
+        # Grid is shifted if using 40MHz wide channel since LO is either above or below the primary channel that L-LTF is on
+        subcarrier_frequencies, _ = csi_processing.get_csi_sto_correction_frequencies("lltf", self.secondary_channel_relative)
+        sto_delay_correction = _sto_delay_correction(delay, subcarrier_frequencies)
+        csi_lltf *= sto_delay_correction
 
         return csi_lltf
 
@@ -280,39 +321,33 @@ class CSICluster(SensorCluster):
         assert self.has_ht20ltf
         csi_ht20 = np.zeros(self.shape + (csi_packet.HT_COEFFICIENTS_PER_CHANNEL,), dtype=np.complex64)
 
+        # Uncompressed HT-LTF is collected first and decoded for all sensors at once
+        iq8_positions, iq8_buffers = [], []
+
         def deserialize_ht20_packet(b, r, a, serialized_csi):
             nonlocal csi_ht20
-            csi_ht20_sensor = csi_ht20[b, r, a, :].view()
-
             if serialized_csi.is_compressed:
-                csi_ht20_sensor[:] = csi_compression.decode_compressed_ht20(serialized_csi.buf)
+                csi_ht20[b, r, a, :] = csi_compression.decode_compressed_ht20(serialized_csi.buf)
                 return
 
-            # The ESP32 provides CSI as int8_t values in (im, re) pairs (in this order!)
-            # To go from the (re, im) interpretation to (im, re), compute conjugate and multiply by 1.0j.
             # If channel bonding is used, provide CSI of primary channel
-            if csi_packet.WiFiPacketRxControlV3(serialized_csi.rx_ctrl).he_siga1 & 0x80 != 0:
-                ht40_bytes = np.frombuffer(serialized_csi.buf[:_RAW_HT40_BYTES], dtype=np.int8)
-                htltf_lower = ht40_bytes[:_RAW_HT20_BYTES]
-                htltf_higher = ht40_bytes[_RAW_HT20_BYTES + (csi_packet.HT40_GAP_SUBCARRIERS * 2) : _RAW_HT40_BYTES]
-                primary = htltf_higher if self.secondary_channel_relative == -1 else htltf_lower
-                csi_ht20_sensor[:] = np.asarray(primary, dtype=np.int8).astype(np.float32).view(np.complex64)
-            else:
-                csi_ht20_sensor[:] = np.frombuffer(serialized_csi.buf[:_RAW_HT20_BYTES], dtype=np.int8).astype(np.float32).view(np.complex64)
-            csi_ht20_sensor[:] = -1.0j * np.conj(csi_ht20_sensor)
+            primary_offset = 0
+            if serialized_csi.rx_control.he_siga1 & 0x80 != 0 and self.secondary_channel_relative == -1:
+                primary_offset = _RAW_HT20_BYTES + (csi_packet.HT40_GAP_SUBCARRIERS * 2)
+            iq8_positions.append((b, r, a))
+            iq8_buffers.append(serialized_csi.buf[primary_offset : primary_offset + _RAW_HT20_BYTES])
 
         self._foreach_complete_sensor(deserialize_ht20_packet)
 
+        if iq8_positions:
+            csi_ht20[tuple(np.transpose(iq8_positions))] = csi_packet._unpack_iq8(b"".join(iq8_buffers), csi_packet.HT_COEFFICIENTS_PER_CHANNEL)
+
         # Need to take timestamps into account to provide phase coherence across all sensors
         delay = self.sensor_timestamps
-        subcarrier_range = csi_packet.get_csi_format_subcarrier_indices("ht20").astype(np.float64)[np.newaxis, np.newaxis, np.newaxis, :]
-
-        # Need to adjust range if using 40MHz wide channel since LO is either above or below the primary channel that HT20 is on
-        subcarrier_range -= self.secondary_channel_relative * int(2 * constants.WIFI_CHANNEL_SPACING / constants.WIFI_SUBCARRIER_SPACING)
-
-        # 128 bit delay is overkill here, CSI is only 2x32 bit, product would be 2x128 bit
-        sto_delay_correction = np.exp(-1.0j * 2 * np.pi * delay[:, :, :, np.newaxis] * constants.WIFI_SUBCARRIER_SPACING * subcarrier_range)
-        csi_ht20 = np.einsum("bras,bras->bras", csi_ht20, sto_delay_correction)
+        # Grid is shifted if using 40MHz wide channel since LO is either above or below the primary channel that HT20 is on
+        subcarrier_frequencies, _ = csi_processing.get_csi_sto_correction_frequencies("ht20", self.secondary_channel_relative)
+        sto_delay_correction = _sto_delay_correction(delay, subcarrier_frequencies)
+        csi_ht20 *= sto_delay_correction
         return csi_ht20
 
     def deserialize_csi_ht40ltf(self):
@@ -330,36 +365,37 @@ class CSICluster(SensorCluster):
             dtype=np.complex64,
         )
 
+        # Uncompressed HT-LTF is collected first and decoded for all sensors at once
+        iq8_positions, iq8_buffers = [], []
+
         def deserialize_ht40_packet(b, r, a, serialized_csi):
             nonlocal csi_ht40
-            csi_ht40_sensor = csi_ht40[b, r, a, :].view()
-            csi_ht40_sensor_lower = csi_ht40[b, r, a, : csi_packet.HT_COEFFICIENTS_PER_CHANNEL].view()
-            csi_ht40_sensor_higher = csi_ht40[b, r, a, -csi_packet.HT_COEFFICIENTS_PER_CHANNEL :].view()
-
             if serialized_csi.is_compressed:
-                csi_ht40_sensor[:] = csi_compression.decode_compressed_ht40(serialized_csi.buf)
+                csi_ht40[b, r, a, :] = csi_compression.decode_compressed_ht40(serialized_csi.buf)
                 return
 
-            # The ESP32 provides CSI as int8_t values in (im, re) pairs (in this order!)
-            # To go from the (re, im) interpretation to (im, re), compute conjugate and multiply by 1.0j.
-            ht40_bytes = np.frombuffer(serialized_csi.buf[:_RAW_HT40_BYTES], dtype=np.int8)
-            csi_ht40_sensor_higher[:] = ht40_bytes[_RAW_HT20_BYTES + (csi_packet.HT40_GAP_SUBCARRIERS * 2) : _RAW_HT40_BYTES].astype(np.float32).view(np.complex64)
-            csi_ht40_sensor_lower[:] = ht40_bytes[:_RAW_HT20_BYTES].astype(np.float32).view(np.complex64)
-            csi_ht40_sensor[:] = -1.0j * np.conj(csi_ht40_sensor)
+            iq8_positions.append((b, r, a))
+            iq8_buffers.append(serialized_csi.buf[:_RAW_HT40_BYTES])
 
         self._foreach_complete_sensor(deserialize_ht40_packet)
 
+        if iq8_positions:
+            csi_ht40_iq8 = csi_packet._unpack_iq8(b"".join(iq8_buffers), csi_ht40.shape[-1])
+            # No CSI is reported for the gap between lower and higher channel
+            csi_ht40_iq8[:, csi_packet.HT_COEFFICIENTS_PER_CHANNEL : -csi_packet.HT_COEFFICIENTS_PER_CHANNEL] = 0
+            csi_ht40[tuple(np.transpose(iq8_positions))] = csi_ht40_iq8
+
         # Secondary channel experiences phase shift by pi / 2
         # This is likely due to the pi / 2 phase shift specified for the pilot symbols,
         # see IEEE 80211-2012 section 20.3.9.3.4 L-LTF definition
-        csi_ht40_higher = csi_ht40[:, :, :, : csi_packet.HT_COEFFICIENTS_PER_CHANNEL].view()
-        csi_ht40_higher[:] = csi_ht40_higher * np.exp(1.0j * np.pi / 2)
+        # Rotate the secondary channel by +pi / 2 to align its phase with the primary channel
+        csi_ht40[..., : csi_packet.HT_COEFFICIENTS_PER_CHANNEL] *= 1j
 
         # Need to take timestamps into account to provide phase coherence across all sensors
         delay = self.sensor_timestamps
-        subcarrier_range = csi_packet.get_csi_format_subcarrier_indices("ht40").astype(np.float64)[np.newaxis, np.newaxis, np.newaxis, :]
-        sto_delay_correction = np.exp(-1.0j * 2 * np.pi * delay[:, :, :, np.newaxis] * constants.WIFI_SUBCARRIER_SPACING * subcarrier_range)
-        csi_ht40 = np.einsum("bras,bras->bras", csi_ht40, sto_delay_correction)
+        subcarrier_frequencies, _ = csi_processing.get_csi_sto_correction_frequencies("ht40")
+        sto_delay_correction = _sto_delay_correction(delay, subcarrier_frequencies)
+        csi_ht40 *= sto_delay_correction
 
         return csi_ht40
 
@@ -374,24 +410,28 @@ class CSICluster(SensorCluster):
         assert self.has_he20ltf
         csi_he20 = np.zeros(self.shape + (csi_packet.HE20_COEFFICIENTS_PER_CHANNEL,), dtype=np.complex64)
 
+        # Uncompressed HE-LTF is collected first and decoded for all sensors at once
+        iq8_positions, iq8_buffers = [], []
+
         def deserialize_he20_packet(b, r, a, serialized_csi):
             nonlocal csi_he20
-            csi_he20_sensor = csi_he20[b, r, a, :].view()
-
             if serialized_csi.is_compressed:
-                csi_he20_sensor[:] = csi_compression.decode_compressed_he20(serialized_csi.buf)
+                csi_he20[b, r, a, :] = csi_compression.decode_compressed_he20(serialized_csi.buf)
                 return
 
-            he20_raw = np.frombuffer(serialized_csi.buf[:_RAW_HE20_BYTES], dtype=np.int8).astype(np.float32).view(np.complex64)
-            csi_he20_sensor[:] = -1.0j * np.conj(he20_raw)
+            iq8_positions.append((b, r, a))
+            iq8_buffers.append(serialized_csi.buf[:_RAW_HE20_BYTES])
 
         self._foreach_complete_sensor(deserialize_he20_packet)
 
+        if iq8_positions:
+            csi_he20[tuple(np.transpose(iq8_positions))] = csi_packet._unpack_iq8(b"".join(iq8_buffers), csi_packet.HE20_COEFFICIENTS_PER_CHANNEL)
+
         delay = self.sensor_timestamps
         he20_fractional_delay = self._get_he20_fractional_timestamp_offsets()
-        subcarrier_range = csi_packet.get_csi_format_subcarrier_indices("he20").astype(np.float64)[np.newaxis, np.newaxis, np.newaxis, :]
-        sto_delay_correction = np.exp(-1.0j * 2 * np.pi * (delay + he20_fractional_delay)[:, :, :, np.newaxis] * (constants.WIFI_SUBCARRIER_SPACING / 4.0) * subcarrier_range)
-        csi_he20 = np.einsum("bras,bras->bras", csi_he20, sto_delay_correction)
+        subcarrier_frequencies, _ = csi_processing.get_csi_sto_correction_frequencies("he20")
+        sto_delay_correction = _sto_delay_correction(delay + he20_fractional_delay, subcarrier_frequencies)
+        csi_he20 *= sto_delay_correction
         csi_he20[..., 121:124] = 0.0
         return csi_he20
 
@@ -402,22 +442,7 @@ class CSICluster(SensorCluster):
 
         :return: True if there is L-LTF CSI data for all complete sensors, False otherwise
         """
-        have_lltf_all = True
-
-        def check_lltf(b, r, a, serialized_csi):
-            nonlocal have_lltf_all
-            if serialized_csi.csi_len == 0:
-                have_lltf_all = False
-                return
-            # We only need to check this if acquire_force_lltf is false (otherwise, sensor always provides L-LTF)
-            if not serialized_csi.acquire_force_lltf:
-                # If force lltf is false, sensor module is configured to only provide L-LTF if frame is 802.11g
-                if not csi_packet.WiFiPacketRxControlV3(serialized_csi.rx_ctrl).cur_bb_format == csi_packet.WiFiRxBasebandFormat.RX_BB_FORMAT_11G:
-                    have_lltf_all = False
-
-        self._foreach_complete_sensor(check_lltf)
-
-        return have_lltf_all
+        return bool(self._available_csi_formats & _CSI_FORMAT_LLTF)
 
     @property
     def has_ht20ltf(self) -> bool:
@@ -426,23 +451,7 @@ class CSICluster(SensorCluster):
 
         :return: True if there is HT20 CSI data for all complete sensors, False otherwise
         """
-        have_ht20_all = True
-
-        def check_ht20(b, r, a, serialized_csi):
-            nonlocal have_ht20_all
-            if serialized_csi.csi_len == 0:
-                have_ht20_all = False
-                return
-            # If force lltf is true, sensor only provides L-LTF, never HT20-LTF
-            if serialized_csi.acquire_force_lltf:
-                have_ht20_all = False
-
-            if not csi_packet.WiFiPacketRxControlV3(serialized_csi.rx_ctrl).cur_bb_format == csi_packet.WiFiRxBasebandFormat.RX_BB_FORMAT_HT:
-                have_ht20_all = False
-
-        self._foreach_complete_sensor(check_ht20)
-
-        return have_ht20_all
+        return bool(self._available_csi_formats & _CSI_FORMAT_HT20)
 
     @property
     def has_ht40ltf(self) -> bool:
@@ -451,58 +460,14 @@ class CSICluster(SensorCluster):
 
         :return: True if there is HT40 CSI data for all complete sensors, False otherwise
         """
-        have_ht40_all = True
-
-        def check_ht40(b, r, a, serialized_csi):
-            nonlocal have_ht40_all
-            if serialized_csi.csi_len == 0:
-                have_ht40_all = False
-                return
-            # If force lltf is true, sensor only provides L-LTF, never HT40-LTF
-            if serialized_csi.acquire_force_lltf:
-                have_ht40_all = False
-
-            # Check if packet is HT (HT20 or HT40)
-            if not csi_packet.WiFiPacketRxControlV3(serialized_csi.rx_ctrl).cur_bb_format == csi_packet.WiFiRxBasebandFormat.RX_BB_FORMAT_HT:
-                have_ht40_all = False
-
-            # Check if channel bonding is used: he_siga1 is actuall ht_sig1, which contains the CWB bit at bit 7
-            if csi_packet.WiFiPacketRxControlV3(serialized_csi.rx_ctrl).he_siga1 & 0x80 == 0:
-                have_ht40_all = False
-
-        self._foreach_complete_sensor(check_ht40)
-
-        return have_ht40_all
+        return bool(self._available_csi_formats & _CSI_FORMAT_HT40)
 
     @property
     def has_he20ltf(self) -> bool:
         """
         Check if HE20 HE-LTF channel estimates are available for all complete sensors.
         """
-        have_he20_all = True
-
-        def check_he20(b, r, a, serialized_csi):
-            nonlocal have_he20_all
-            if serialized_csi.csi_len == 0:
-                have_he20_all = False
-                return
-            if serialized_csi.acquire_force_lltf:
-                have_he20_all = False
-                return
-
-            rx_ctrl = csi_packet.WiFiPacketRxControlV3(serialized_csi.rx_ctrl)
-            if not self._is_he_format(rx_ctrl.cur_bb_format):
-                have_he20_all = False
-                return
-            if rx_ctrl.second != 0:
-                have_he20_all = False
-                return
-            if csi_packet.WiFiPacketRxControlV3(serialized_csi.rx_ctrl).rx_channel_estimate_len < _RAW_HE20_BYTES:
-                have_he20_all = False
-
-        self._foreach_complete_sensor(check_he20)
-
-        return have_he20_all
+        return bool(self._available_csi_formats & _CSI_FORMAT_HE20)
 
     @property
     def secondary_channel_relative(self):
@@ -511,19 +476,16 @@ class CSICluster(SensorCluster):
 
         :return: 0 if no secondary channel is used, 1 if the secondary channel is above the primary channel, -1 if the secondary channel is below the primary channel
         """
+        rx_ctrl = self._first_complete_sensor().rx_control
+
         # 802.11b packets: No secondary channel, return 0
-        if csi_packet.WiFiPacketRxControlV3(self._first_complete_sensor().rx_ctrl).cur_bb_format == csi_packet.WiFiRxBasebandFormat.RX_BB_FORMAT_11B:
+        if rx_ctrl.cur_bb_format == csi_packet.WiFiRxBasebandFormat.RX_BB_FORMAT_11B:
             return 0
 
-        match csi_packet.WiFiPacketRxControlV3(self._first_complete_sensor().rx_ctrl).second:
-            case 0:
-                return 0
-            case 1:
-                return 1
-            case 2:
-                return -1
+        if rx_ctrl.second >= len(_SECONDARY_CHANNEL_RELATIVE):
+            raise ValueError("Unknown secondary channel value")
 
-        raise ValueError("Unknown secondary channel value")
+        return _SECONDARY_CHANNEL_RELATIVE[rx_ctrl.second]
 
     @property
     def primary_channel(self) -> int:
@@ -532,7 +494,7 @@ class CSICluster(SensorCluster):
 
         :return: The primary channel number
         """
-        return csi_packet.WiFiPacketRxControlV3(self._first_complete_sensor().rx_ctrl).channel
+        return self._first_complete_sensor().rx_control.channel
 
     @property
     def is_11b(self) -> bool:
@@ -541,7 +503,7 @@ class CSICluster(SensorCluster):
 
         :return: True if the packet is 802.11b, False otherwise
         """
-        return csi_packet.WiFiPacketRxControlV3(self._first_complete_sensor().rx_ctrl).cur_bb_format == csi_packet.WiFiRxBasebandFormat.RX_BB_FORMAT_11B
+        return self._first_complete_sensor().rx_control.cur_bb_format == csi_packet.WiFiRxBasebandFormat.RX_BB_FORMAT_11B
 
     @property
     def secondary_channel(self) -> int:
@@ -560,14 +522,23 @@ class CSICluster(SensorCluster):
 
         :return: A numpy array of shape :code:`(boardcount, constants.ROWS_PER_BOARD, constants.ANTENNAS_PER_ROW)` that contains the sensor timestamps in seconds
         """
-        sensor_timestamps = np.full(self.shape, np.nan, dtype=np.float64)
+        # The latched timestamps are exact integer nanoseconds, only the
+        # sub-microsecond cycle offset needs floating point arithmetic
+        hw_latched_timestamps_ns = np.zeros(self.shape, dtype=np.int64)
+        rxstart_time_cyc = np.full(self.shape, np.nan, dtype=np.float64)
 
         def append_sensor_timestamp(b, r, a, serialized_csi):
-            timestamp_ns = np.float64(self._nanosecond_timestamp(serialized_csi))
-            sensor_timestamps[b, r, a] = np.float64(timestamp_ns) / 1e9
+            hw_latched_timestamps_ns[b, r, a] = serialized_csi.global_timestamp_us * 1000
+            rxstart_time_cyc[b, r, a] = serialized_csi.rx_control.rxstart_time_cyc
 
         self._foreach_complete_sensor(append_sensor_timestamp)
-        return sensor_timestamps
+
+        # "official" formula by Espressif:
+        # timestamp_ns = serialized_csi.timestamp * 1000 + ((rxstart_time_cyc * 12500) // 1000) + ((rxstart_time_cyc_dec * 1562) // 1000) - 20800
+        # Formula that is probably more accurate:
+        CYC_PERIOD_NS = 1 / 80e6 * 1e9
+        HW_TIMESTAMP_LAG_NS = 20800
+        return (hw_latched_timestamps_ns - HW_TIMESTAMP_LAG_NS + rxstart_time_cyc * CYC_PERIOD_NS) / 1e9
 
     @property
     def host_timestamp(self):
@@ -661,44 +632,53 @@ class CSICluster(SensorCluster):
 
     # Internal helper functions
     def _foreach_complete_sensor(self, callback):
-        for b, board in enumerate(self._csi_packets):
-            for r, row in enumerate(board):
-                for a, serialized_csi in enumerate(row):
-                    if serialized_csi is not None:
-                        callback(b, r, a, serialized_csi)
+        for b, r, a, serialized_csi in self._complete_sensors:
+            callback(b, r, a, serialized_csi)
 
     def _first_complete_sensor(self):
-        for board in self._csi_packets:
-            for row in board:
-                for serialized_csi in row:
-                    if serialized_csi is not None:
-                        return serialized_csi
+        return self._complete_sensors[0][3] if self._complete_sensors else None
 
-        return None
-
-    def _nanosecond_timestamp(self, serialized_csi):
-        rxstart_time_cyc = csi_packet.WiFiPacketRxControlV3(serialized_csi.rx_ctrl).rxstart_time_cyc
-
-        hw_latched_timestamp_ns = serialized_csi.global_timestamp_us * 1000
-
-        # "official" formula by Espressif:
-        # timestamp_ns = np.float128(serialized_csi.timestamp * 1000 + ((rxstart_time_cyc * 12500) // 1000) + ((rxstart_time_cyc_dec * 1562) // 1000) - 20800)
-        # Formula that is probably more accurate:
-        CYC_PERIOD_NS = 1 / 80e6 * 1e9
-        HW_TIMESTAMP_LAG_NS = 20800
-        return hw_latched_timestamp_ns - HW_TIMESTAMP_LAG_NS + rxstart_time_cyc * CYC_PERIOD_NS
+    @staticmethod
+    def _interpolate_sparse_lltf(csi_lltf):
+        # Sparse 12-bit L-LTF only covers every second subcarrier, interpolate to get full 53 subcarriers
+        csi_lltf[..., 1::2] = 0.5 * (csi_lltf[..., 0:-1:2] + csi_lltf[..., 2::2])
+        return csi_lltf
 
     def _get_he20_fractional_timestamp_offsets(self):
         fractional_offsets = np.full(self.shape, np.nan, dtype=np.float64)
 
         def append_fractional_offset(b, r, a, serialized_csi):
-            rxstart_time_cyc_dec = csi_packet.WiFiPacketRxControlV3(serialized_csi.rx_ctrl).rxstart_time_cyc_dec
+            rxstart_time_cyc_dec = serialized_csi.rx_control.rxstart_time_cyc_dec
             rxstart_time_cyc_dec = 2048 - rxstart_time_cyc_dec if rxstart_time_cyc_dec >= 1024 else rxstart_time_cyc_dec
             fractional_offsets[b, r, a] = float(rxstart_time_cyc_dec) / 640e6
 
         self._foreach_complete_sensor(append_fractional_offset)
         return fractional_offsets
 
+    @classmethod
+    def _get_csi_formats(cls, serialized_csi) -> int:
+        """Determine which channel estimates one sensor provides, as _CSI_FORMAT_* flags."""
+        if serialized_csi.csi_len == 0:
+            return 0
+
+        rx_ctrl = serialized_csi.rx_control
+        # If force lltf is true, sensor always provides L-LTF, but never HT-LTF or HE-LTF
+        if serialized_csi.acquire_force_lltf:
+            return _CSI_FORMAT_LLTF
+
+        formats = 0
+        # If force lltf is false, sensor module is configured to only provide L-LTF if frame is 802.11g
+        if rx_ctrl.cur_bb_format == csi_packet.WiFiRxBasebandFormat.RX_BB_FORMAT_11G:
+            formats |= _CSI_FORMAT_LLTF
+        if rx_ctrl.cur_bb_format == csi_packet.WiFiRxBasebandFormat.RX_BB_FORMAT_HT:
+            formats |= _CSI_FORMAT_HT20
+            # Check if channel bonding is used: he_siga1 is actuall ht_sig1, which contains the CWB bit at bit 7
+            if rx_ctrl.he_siga1 & 0x80 != 0:
+                formats |= _CSI_FORMAT_HT40
+        if cls._is_he_format(rx_ctrl.cur_bb_format) and rx_ctrl.second == 0 and rx_ctrl.rx_channel_estimate_len >= _RAW_HE20_BYTES:
+            formats |= _CSI_FORMAT_HE20
+        return formats
+
     @staticmethod
     def _is_he_format(bb_format: int) -> bool:
         return bb_format in (
@@ -79,15 +79,16 @@ class CompressedRxControl(ctypes.LittleEndianStructure):
 
 
 assert ctypes.sizeof(CompressedRxControl) == 24
+_COMPRESSED_RX_CTRL_SIZE = ctypes.sizeof(CompressedRxControl)
 COMPRESSED_RX_CTRL_MIN_SIZE = 22
 
 
 def _build_rx_ctrl_v3_from_compressed(compact_raw: bytes) -> bytes:
-    compact_buf = bytes(compact_raw)
-    if len(compact_buf) < ctypes.sizeof(CompressedRxControl):
-        compact_buf += bytes(ctypes.sizeof(CompressedRxControl) - len(compact_buf))
-    compact = CompressedRxControl(compact_buf)
-    ctrl = csi_packet.WiFiPacketRxControlV3(bytes(ctypes.sizeof(csi_packet.WiFiPacketRxControlV3)))
+    # from_buffer_copy reads any buffer directly, only short (older) layouts need padding
+    if len(compact_raw) < _COMPRESSED_RX_CTRL_SIZE:
+        compact_raw = bytes(compact_raw) + bytes(_COMPRESSED_RX_CTRL_SIZE - len(compact_raw))
+    compact = CompressedRxControl.from_buffer_copy(compact_raw)
+    ctrl = csi_packet.WiFiPacketRxControlV3.from_buffer_copy(bytes(csi_packet._RX_CTRL_V3_SIZE))
     ctrl.rssi = int(compact.rssi)
     ctrl.rate = int(compact.rate)
     ctrl.sig_mode = int(compact.sig_mode)
@@ -111,14 +112,15 @@ def _build_rx_ctrl_v3_from_compressed(compact_raw: bytes) -> bytes:
     ctrl.rx_gain = int(compact.rx_gain)
     ctrl.rx_channel_estimate_len = int(compact.rx_channel_estimate_len)
     ctrl.rx_channel_estimate_info_vld = 1 if (compact.flags & RX_CONTROL_FLAG_CHANNEL_ESTIMATE_INFO_VALID) else 0
-    return ctypes.string_at(ctypes.byref(ctrl), ctypes.sizeof(ctrl))
+    return ctypes.string_at(ctypes.byref(ctrl), csi_packet._RX_CTRL_V3_SIZE)
 
 
 def _decode_wire_complex_i16_scaled(buf, pair_count, tap_scale: float):
     right_shift = int(np.frombuffer(buf[:1], dtype=np.uint8)[0])
     values = np.frombuffer(buf[1 : 1 + pair_count * 4], dtype="<i2").astype(np.float32)
     values *= float(1 << right_shift) / tap_scale
-    return (values[0::2] + 1.0j * values[1::2]).astype(np.complex64)
+    # Scaled (re, im) float32 pairs already have the memory layout of complex64
+    return values.view(np.complex64)
 
 
 def _ifftshift_1d(values: np.ndarray) -> np.ndarray:
@@ -582,7 +584,7 @@ def _decode_compressed_tap_window(
     tap_scale: float,
 ) -> np.ndarray:
     observed_taps = _decode_wire_complex_i16_scaled(buf, tap_count, tap_scale)
-    corrected_taps = np.matmul(correction, observed_taps.astype(np.complex64))
+    corrected_taps = np.matmul(correction, observed_taps)
     centered_cir = np.zeros((fft_size,), dtype=np.complex64)
     centered_cir[tap_start : tap_start + tap_count] = corrected_taps
     centered_spectrum = _centered_fft(centered_cir, fft_size)
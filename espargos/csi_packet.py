@@ -8,6 +8,7 @@ radar transmit reports have their own parser in :mod:`espargos.radar_packet`.
 from enum import IntEnum
 import ctypes
 import binascii
+import struct
 import numpy as np
 
 from . import constants
@@ -61,6 +62,9 @@ SERIALIZED_CSI_TLV_FRAME_FLAG_FIRST_WORD_INVALID = 1 << 2
 SERIALIZED_CSI_TLV_ACQUIRE_FLAG_FORCE_LLTF = 1 << 0
 SERIALIZED_CSI_TLV_ACQUIRE_FLAG_LLTF_8BIT_MODE = 1 << 1
 
+_TYPE_HEADER = struct.Struct("<I")
+_TLV_LENGTH = struct.Struct("<H")
+
 
 def get_csi_format_subcarrier_count(preamble_format: str) -> int:
     if preamble_format == "lltf":
@@ -202,15 +206,13 @@ class WiFiPacketRxControlV3(ctypes.LittleEndianStructure):
     def _byte_to_signed(value: int) -> int:
         """Interpret an unsigned byte as a two's-complement value."""
 
-        value = int(value) & 0xFF
-        return value - 0x100 if value & 0x80 else value
+        return ((int(value) & 0xFF) ^ 0x80) - 0x80
 
     @staticmethod
     def _signed15(value: int) -> int:
         """Interpret the lower 15 bits as a signed two's-complement value."""
 
-        value = int(value) & 0x7FFF
-        return value - 0x8000 if value & 0x4000 else value
+        return ((int(value) & 0x7FFF) ^ 0x4000) - 0x4000
 
     @property
     def rssi_signed(self) -> int:
@@ -256,6 +258,7 @@ class WiFiPacketRxControlV3(ctypes.LittleEndianStructure):
 
 
 assert ctypes.sizeof(WiFiPacketRxControlV3) == 64
+_RX_CTRL_V3_SIZE = ctypes.sizeof(WiFiPacketRxControlV3)
 
 
 class CSIPacket:
@@ -270,12 +273,15 @@ class CSIPacket:
             raise ValueError("CSI TLV packet too short")
 
         self._raw = raw
-        self.type_header = int.from_bytes(raw[0:4], byteorder="little")
+        self.type_header = _TYPE_HEADER.unpack_from(raw)[0]
+        if self.type_header != CSI_TYPE_HEADER:
+            raise ValueError(f"Unexpected CSI type header 0x{self.type_header:08x}")
         self.source_mac = bytes(6)
         self.destination_mac = bytes(6)
-        self.sequence_control = SequenceControl(b"\x00\x00")
+        # Parsed from the frame meta TLV; zero-valued defaults are only constructed if it is absent
+        self.sequence_control = None
         self.frame_flags = 0
-        self.frame_ctrl = FrameControl(b"\x00\x00")
+        self.frame_ctrl = None
         self.timestamp = 0
         self.global_timestamp_us = 0
         self.acquire_flags = 0
@@ -284,6 +290,7 @@ class CSIPacket:
         self.gain_table_entry_raw = bytes(12)
         self.gain_table_entry_valid = False
         self.rx_ctrl = bytes()
+        self._rx_control = None
         self.buf = bytes()
         self.csi_len = 0
         self._is_compressed = False
@@ -292,30 +299,32 @@ class CSIPacket:
         self._raw_csi_tlv = None
         self._raw_csi_padded_len = 0
 
+        # TLV values are sliced from a memoryview, so only fields that are kept get copied
+        raw_view = memoryview(raw)
         offset = 4
         while offset < len(raw):
             if offset + 3 > len(raw):
                 raise ValueError("Malformed CSI TLV header")
 
             tlv_type = raw[offset]
-            tlv_len = int.from_bytes(raw[offset + 1 : offset + 3], byteorder="little")
+            tlv_len = _TLV_LENGTH.unpack_from(raw, offset + 1)[0]
             tlv_start = offset
             offset += 3
             tlv_end = offset + tlv_len
             if tlv_end > len(raw):
                 raise ValueError("Malformed CSI TLV length")
 
-            value = raw[offset:tlv_end]
+            value = raw_view[offset:tlv_end]
 
             if tlv_type == SERIALIZED_CSI_TLV_TYPE_FRAME_META:
                 if tlv_len < 16:
                     raise ValueError("Invalid frame meta TLV")
                 self.source_mac = bytes(value[0:6])
                 self.destination_mac = bytes(value[6:12])
-                self.sequence_control = SequenceControl(value[12:14])
+                self.sequence_control = SequenceControl.from_buffer_copy(value, 12)
                 self.frame_flags = int.from_bytes(value[14:16], byteorder="little")
                 if tlv_len >= 18:
-                    self.frame_ctrl = FrameControl(value[16:18])
+                    self.frame_ctrl = FrameControl.from_buffer_copy(value, 16)
             elif tlv_type == SERIALIZED_CSI_TLV_TYPE_TIMING_META:
                 if tlv_len < 8:
                     raise ValueError("Invalid timing meta TLV")
@@ -333,19 +342,21 @@ class CSIPacket:
                 self.gain_table_entry_valid = True
             elif tlv_type == SERIALIZED_CSI_TLV_TYPE_RX_CTRL_RAW:
                 self.rx_ctrl = bytes(value)
-                if len(self.rx_ctrl) >= ctypes.sizeof(WiFiPacketRxControlV3):
-                    self.timestamp = WiFiPacketRxControlV3(self.rx_ctrl).timestamp
+                self._rx_control = None
+                if len(self.rx_ctrl) >= _RX_CTRL_V3_SIZE:
+                    self.timestamp = self.rx_control.timestamp
             elif tlv_type == SERIALIZED_CSI_TLV_TYPE_RX_CTRL_COMPRESSED:
                 if tlv_len < csi_compression.COMPRESSED_RX_CTRL_MIN_SIZE:
                     raise ValueError("Invalid compressed RX CTRL TLV")
-                self.rx_ctrl = csi_compression._build_rx_ctrl_v3_from_compressed(bytes(value[: ctypes.sizeof(csi_compression.CompressedRxControl)]))
-                self.timestamp = WiFiPacketRxControlV3(self.rx_ctrl).timestamp
+                self.rx_ctrl = csi_compression._build_rx_ctrl_v3_from_compressed(value[: csi_compression._COMPRESSED_RX_CTRL_SIZE])
+                self._rx_control = None
+                self.timestamp = self.rx_control.timestamp
             elif tlv_type == SERIALIZED_CSI_TLV_TYPE_CSI_RAW:
-                self._raw_csi_tlv = bytes(value)
+                self._raw_csi_tlv = value
                 self._raw_csi_padded_len = tlv_len
                 self._is_compressed = False
             elif tlv_type == SERIALIZED_CSI_TLV_TYPE_CSI_COMPRESSED:
-                self._raw_csi_tlv = bytes(value)
+                self._raw_csi_tlv = value
                 self._raw_csi_padded_len = tlv_len
                 self._is_compressed = True
             elif tlv_type == SERIALIZED_CSI_TLV_TYPE_CRC32:
@@ -354,7 +365,7 @@ class CSIPacket:
                 if tlv_end != len(raw):
                     raise ValueError("CRC32 TLV must be last")
                 self.crc32 = int.from_bytes(value, byteorder="little")
-                computed_crc = binascii.crc32(raw[:tlv_start]) & 0xFFFFFFFF
+                computed_crc = binascii.crc32(raw_view[:tlv_start]) & 0xFFFFFFFF
                 if computed_crc != self.crc32:
                     raise ValueError(f"CSI TLV CRC32 mismatch (expected 0x{self.crc32:08x}, computed 0x{computed_crc:08x})")
                 self._crc_valid = True
@@ -362,6 +373,10 @@ class CSIPacket:
 
         if not self._crc_valid:
             raise ValueError("CSI TLV CRC32 missing")
+        if self.sequence_control is None:
+            self.sequence_control = SequenceControl.from_buffer_copy(b"\x00\x00")
+        if self.frame_ctrl is None:
+            self.frame_ctrl = FrameControl.from_buffer_copy(b"\x00\x00")
         if not self.rx_ctrl:
             raise ValueError("CSI TLV missing RX CTRL metadata")
 
@@ -369,14 +384,21 @@ class CSIPacket:
             if self._is_compressed:
                 logical_csi_len = min(1 + csi_compression.COMPRESSED_TAP_COUNT * 4, self._raw_csi_padded_len)
             else:
-                logical_csi_len = min(WiFiPacketRxControlV3(self.rx_ctrl).rx_channel_estimate_len, self._raw_csi_padded_len)
+                logical_csi_len = min(self.rx_control.rx_channel_estimate_len, self._raw_csi_padded_len)
 
-            self.buf = self._raw_csi_tlv[:logical_csi_len]
+            self.buf = bytes(self._raw_csi_tlv[:logical_csi_len])
             self.csi_len = logical_csi_len
 
     def __bytes__(self):
         return self._raw
 
+    @property
+    def rx_control(self) -> WiFiPacketRxControlV3:
+        """The ``rx_ctrl`` metadata parsed as :class:`WiFiPacketRxControlV3`, decoded once and then reused."""
+        if self._rx_control is None:
+            self._rx_control = WiFiPacketRxControlV3.from_buffer_copy(self.rx_ctrl)
+        return self._rx_control
+
     @property
     def is_radar(self):
         return bool(self.frame_flags & SERIALIZED_CSI_TLV_FRAME_FLAG_IS_RADAR)
@@ -409,15 +431,34 @@ class CSIPacket:
     def is_compressed(self):
         return self._is_compressed
 
-    def _decode_lltf8(self) -> np.ndarray:
-        """Decode signed 8-bit complex pairs from this packet's CSI payload."""
 
-        values = np.frombuffer(self.buf[: LEGACY_COEFFICIENTS_PER_CHANNEL * 2], dtype=np.int8).astype(np.float32).view(np.complex64)
-        return -1.0j * np.conj(values)
+def _unpack_lltf12(raw: bytes, value_count: int) -> np.ndarray:
+    """
+    Decode signed 12-bit values packed into little-endian 16-bit words.
+
+    ``raw`` may hold the payloads of several packets back to back, each with
+    ``value_count`` values. The result has shape ``(packets, value_count)``.
+    """
 
-    def _decode_lltf12(self, value_count: int) -> np.ndarray:
-        """Decode packed signed 12-bit values from this packet's CSI payload."""
+    words = np.frombuffer(raw, dtype="<u2").astype(np.int16)
+    # Branchless sign extension of the lower 12 bits
+    values = ((words & 0x0FFF) ^ 0x0800) - 0x0800
+    return values.reshape(-1, value_count)
+
+
+def _unpack_iq8(raw: bytes, coefficient_count: int) -> np.ndarray:
+    """
+    Decode signed 8-bit complex channel coefficients.
+
+    The ESP32 provides CSI as int8_t values in (im, re) pairs (in this order!).
+    Going from the (re, im) interpretation to (im, re) means taking the conjugate
+    and multiplying by -1.0j, which amounts to swapping and negating both parts.
+    ``raw`` may hold the payloads of several packets back to back, each with
+    ``coefficient_count`` coefficients. The result has shape ``(packets, coefficient_count)``.
+    """
 
-        raw = np.frombuffer(self.buf[: value_count * 2], dtype=np.uint8)
-        words = (raw[0::2].astype(np.uint16) | (raw[1::2].astype(np.uint16) << 8)).astype(np.uint16)
-        return (((words.astype(np.int16) << 4) >> 4)).astype(np.int16)
+    pairs = np.frombuffer(raw, dtype=np.int8).reshape(-1, coefficient_count, 2)
+    values = np.empty(pairs.shape[:-1], dtype=np.complex64)
+    np.negative(pairs[..., 1], out=values.real, dtype=np.float32)
+    np.negative(pairs[..., 0], out=values.imag, dtype=np.float32)
+    return values
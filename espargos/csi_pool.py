@@ -49,7 +49,7 @@ _CACHE_CALIBRATION = "calibration"
 class CSIPool(Pool):
     """Manage Wi-Fi features and assemble CSI for each received Wi-Fi packet."""
 
-    def __init__(self, boards: list[board.Board], ota_cache_timeout=5, reference_generator_boards=None):
+    def __init__(self, boards: list[board.Board], ota_cache_timeout=5, reference_generator_boards=None, ota_cache_size=4096):
         """
         Constructor for the CSIPool class.
 
@@ -60,11 +60,17 @@ class CSIPool(Pool):
                               that is / are not part of the pool (only controller is used to generate packets, sensors not used).
                               If provided, sends calibration command to these boards, which will then generate the calibration signal
                               during calibration phase.
+        :param ota_cache_size: Optional. The maximum number of incomplete over-the-air clusters that are kept. When a new Wi-Fi packet
+                               arrives while the cache is full, the oldest incomplete cluster is discarded early. None disables the limit.
         """
+        if ota_cache_size is not None and ota_cache_size < 1:
+            raise ValueError("ota_cache_size must be positive or None")
+
         super().__init__(boards)
         self._reference_generator_boards = reference_generator_boards if reference_generator_boards is not None else []
 
         self._ota_cache_timeout = ota_cache_timeout
+        self._ota_cache_size = ota_cache_size
         self._emit_calibration_csi = False
 
         for board_index, board_obj in enumerate(self.boards):
@@ -89,8 +95,7 @@ class CSIPool(Pool):
 
         :param state: The RF switch state to set, must be one of :class:`sensor.RFSwitchState`
         """
-        for board in self.boards + self._reference_generator_boards:
-            board.wifi_rx.set_rf_switch(state)
+        self._map_boards(lambda board_obj: board_obj.wifi_rx.set_rf_switch(state), self.boards + self._reference_generator_boards)
 
     def get_rf_switch(self) -> sensor.RFSwitchState:
         """
@@ -101,11 +106,11 @@ class CSIPool(Pool):
         if not self.boards:
             raise ValueError("No boards in pool to get RF switch state from")
 
-        states = [b.wifi_rx.get_rf_switch() for b in self.boards]
+        states = self._map_boards(lambda board_obj: board_obj.wifi_rx.get_rf_switch())
         return self._reconcile_across_boards(
             states,
             "RF switch state",
-            lambda value: [board.wifi_rx.set_rf_switch(value) for board in self.boards],
+            lambda value: self._map_boards(lambda board_obj: board_obj.wifi_rx.set_rf_switch(value)),
         )
 
     def set_mac_filter(self, mac_filter: dict):
@@ -114,15 +119,13 @@ class CSIPool(Pool):
 
         This is forwarded to :meth:`pyespargos.board_wifi_rx.WiFiRxCapability.set_mac_filter` for each board.
         """
-        for board in self.boards:
-            board.wifi_rx.set_mac_filter(mac_filter)
+        self._map_boards(lambda board_obj: board_obj.wifi_rx.set_mac_filter(mac_filter))
 
     def clear_mac_filter(self):
         """
         Clear the MAC address filter for all boards in the pool.
         """
-        for board in self.boards:
-            board.wifi_rx.clear_mac_filter()
+        self._map_boards(lambda board_obj: board_obj.wifi_rx.clear_mac_filter())
 
     def get_mac_filter(self) -> dict:
         """
@@ -130,22 +133,22 @@ class CSIPool(Pool):
 
         This is forwarded to :meth:`pyespargos.board_wifi_rx.WiFiRxCapability.get_mac_filter` for each board.
         """
-        filters = [b.wifi_rx.get_mac_filter() for b in self.boards]
+        filters = self._map_boards(lambda board_obj: board_obj.wifi_rx.get_mac_filter())
         return self._reconcile_across_boards(
             filters,
             "MAC filter",
-            lambda value: [board.wifi_rx.set_mac_filter(value) for board in self.boards],
+            lambda value: self._map_boards(lambda board_obj: board_obj.wifi_rx.set_mac_filter(value)),
         )
 
     def get_csi_acquisition_config(self) -> dict:
         """
         Return CSI acquire config, reconciling boards when needed.
         """
-        cfgs = [b.wifi_rx.get_csi_acquisition_config() for b in self.boards]
+        cfgs = self._map_boards(lambda board_obj: board_obj.wifi_rx.get_csi_acquisition_config())
         return self._reconcile_across_boards(
             cfgs,
             "CSI acquire config",
-            lambda value: [board.wifi_rx.set_csi_acquisition_config(value) for board in self.boards],
+            lambda value: self._map_boards(lambda board_obj: board_obj.wifi_rx.set_csi_acquisition_config(value)),
         )
 
     def set_csi_acquisition_config(self, config: dict):
@@ -159,34 +162,32 @@ class CSIPool(Pool):
         :param config: CSI acquisition configuration dict to apply to all boards.
         :raises EspargosUnexpectedResponseError: If any board returns an unexpected response.
         """
-        for b in self.boards:
-            b.wifi_rx.set_csi_acquisition_config(config)
+        self._map_boards(lambda board_obj: board_obj.wifi_rx.set_csi_acquisition_config(config))
         _ = self.get_csi_acquisition_config()
 
     def get_cfo_correction(self) -> dict:
         """
         Return CFO correction config, reconciling boards when needed.
         """
-        configs = [b.wifi_rx.get_cfo_correction() for b in self.boards]
+        configs = self._map_boards(lambda board_obj: board_obj.wifi_rx.get_cfo_correction())
         return self._reconcile_across_boards(
             configs,
             "CFO correction",
-            lambda value: [board.wifi_rx.set_cfo_correction(value["auto"], value.get("value", 0)) for board in self.boards],
+            lambda value: self._map_boards(lambda board_obj: board_obj.wifi_rx.set_cfo_correction(value["auto"], value.get("value", 0))),
         )
 
     def set_cfo_correction(self, auto: bool, value: int = 0):
         """
         Configure CFO correction on all boards in this pool.
         """
-        for b in self.boards:
-            b.wifi_rx.set_cfo_correction(auto, value)
+        self._map_boards(lambda board_obj: board_obj.wifi_rx.set_cfo_correction(auto, value))
         _ = self.get_cfo_correction()
 
     def get_gain_settings(self) -> dict:
         """
         Return gain settings, resetting mismatched boards to automatic gain.
         """
-        settings = [b.wifi_rx.get_gain_settings() for b in self.boards]
+        settings = self._map_boards(lambda board_obj: board_obj.wifi_rx.get_gain_settings())
         return self._reconcile_across_boards(
             settings,
             "Gain settings",
@@ -220,18 +221,18 @@ class CSIPool(Pool):
                 for board_settings in per_board_settings:
                     board_settings[key] = value
 
-        for board_obj, board_settings in zip(self.boards, per_board_settings):
-            board_obj.wifi_rx.set_gain_settings(board_settings)
+        settings_by_board = dict(zip(self.boards, per_board_settings))
+        self._map_boards(lambda board_obj: board_obj.wifi_rx.set_gain_settings(settings_by_board[board_obj]))
 
     def get_wifi_channel_overrides(self) -> dict:
         """
         Return per-sensor WiFi channel overrides, reconciling boards when needed.
         """
-        settings = [b.wifi_rx.get_channel_overrides() for b in self.boards]
+        settings = self._map_boards(lambda board_obj: board_obj.wifi_rx.get_channel_overrides())
         return self._reconcile_across_boards(
             settings,
             "WiFi channel overrides",
-            lambda value: [board.wifi_rx.set_channel_overrides(value) for board in self.boards],
+            lambda value: self._map_boards(lambda board_obj: board_obj.wifi_rx.set_channel_overrides(value)),
         )
 
     def set_wifi_channel_overrides(self, settings: dict):
@@ -244,15 +245,14 @@ class CSIPool(Pool):
         :param settings: Per-sensor WiFi channel override settings dict to apply to all boards.
         :raises EspargosUnexpectedResponseError: If any board returns an unexpected response.
         """
-        for b in self.boards:
-            b.wifi_rx.set_channel_overrides(settings)
+        self._map_boards(lambda board_obj: board_obj.wifi_rx.set_channel_overrides(settings))
         _ = self.get_wifi_channel_overrides()
 
     def get_radar_configs(self) -> list[dict]:
         """
         Return radar TX configuration for all boards in the pool.
         """
-        return [b.wifi_tx.get_config() for b in self.boards]
+        return self._map_boards(lambda board_obj: board_obj.wifi_tx.get_config())
 
     def get_radar_config(self) -> dict:
         """
@@ -272,12 +272,11 @@ class CSIPool(Pool):
         if isinstance(config, radar.RadarPoolConfig):
             if len(config.board_configs) != len(self.boards):
                 raise ValueError(f"RadarPoolConfig contains {len(config.board_configs)} board configs, expected {len(self.boards)}")
-            for board_obj, board_config in zip(self.boards, config.board_configs):
-                board_obj.wifi_tx.set_config(board_config)
+            config_by_board = dict(zip(self.boards, config.board_configs))
+            self._map_boards(lambda board_obj: board_obj.wifi_tx.set_config(config_by_board[board_obj]))
             return
 
-        for b in self.boards:
-            b.wifi_tx.set_config(config)
+        self._map_boards(lambda board_obj: board_obj.wifi_tx.set_config(config))
 
     def get_wifi_config(self) -> dict:
         """
@@ -286,11 +285,11 @@ class CSIPool(Pool):
         Board-local calibration fields are excluded from both comparison and
         reconciliation, so each board retains its own values.
         """
-        wifi_configs = [b.wifi_rx.get_config() for b in self.boards]
+        wifi_configs = self._map_boards(lambda board_obj: board_obj.wifi_rx.get_config())
         return self._reconcile_across_boards(
             wifi_configs,
             "WiFi config",
-            lambda value: [board.wifi_rx.set_config(value) for board in self.boards],
+            lambda value: self._map_boards(lambda board_obj: board_obj.wifi_rx.set_config(value)),
             ignore_keys=WIFI_CONFIG_PER_BOARD_KEYS,
         )
 
@@ -309,8 +308,7 @@ class CSIPool(Pool):
         :raises EspargosUnexpectedResponseError: If any board returns an unexpected response.
         """
         wifi_config = {key: value for key, value in wifi_config.items() if key not in WIFI_CONFIG_PER_BOARD_KEYS}
-        for b in self.boards:
-            b.wifi_rx.set_config(wifi_config)
+        self._map_boards(lambda board_obj: board_obj.wifi_rx.set_config(wifi_config))
         _ = self.get_wifi_config()
 
     def reboot(self):
@@ -383,7 +381,7 @@ class CSIPool(Pool):
         """
         self._emit_calibration_csi = bool(enabled)
 
-    def _clusters_to_calibration(self, board_index=None):
+    def _clusters_to_calibration(self, board_index=None, wifi_config=None):
         """
         Convert the collected calibration clusters into per-antenna calibration offsets.
 
@@ -392,27 +390,21 @@ class CSIPool(Pool):
         format (a wider measurement band yields more accurate timing offsets).
 
         :param board_index: If provided, only process calibration clusters for the specified board index
+        :param wifi_config: Wi-Fi configuration of the pool, as returned by :meth:`get_wifi_config`.
+                            If None, it is queried from the boards.
         :return: Tuple of per-antenna timing offsets, phase offsets, the primary channel,
                  and the relative secondary channel position.
         """
         clusters = self._get_cluster_cache_snapshot(_CACHE_CALIBRATION)
 
-        # Collection of complete clusters (= reference CSI data from all antennas available): L-LTF, HT20-LTF, and HT40-LTF
-        complete_clusters_lltf = []
-        complete_cluster_timestamps_lltf = []
-        complete_clusters_ht20 = []
-        complete_cluster_timestamps_ht20 = []
-        complete_clusters_ht40 = []
-        complete_cluster_timestamps_ht40 = []
-        complete_cluster_timestamps = []
-
         # Read Wi-Fi configuration to determine primary/secondary channel
-        wifi_config = self.get_wifi_config()
+        if wifi_config is None:
+            wifi_config = self.get_wifi_config()
         channel_primary = wifi_config.get("channel-primary", None)
         channel_secondary = wifi_config.get("channel-secondary", None)
         channel_secondary = -1 if channel_secondary == 2 else channel_secondary
 
-        any_csi_count = 0
+        matching_clusters = []
         stale_channel_counts: dict[tuple[int | None, int | None], int] = {}
         for cluster in clusters:
             cluster_channel_primary = cluster.primary_channel
@@ -424,23 +416,23 @@ class CSIPool(Pool):
                 )
                 stale_channel_counts[stale_channel] = stale_channel_counts.get(stale_channel, 0) + 1
                 continue
+            matching_clusters.append(cluster)
 
-            completion = cluster.completion[board_index] if board_index is not None else cluster.completion
-            if np.any(completion):
-                any_csi_count = any_csi_count + 1
-
-            if np.all(completion):
-                cluster_timestamps = cluster.sensor_timestamps[board_index] if board_index is not None else cluster.sensor_timestamps
-                complete_cluster_timestamps.append(cluster_timestamps)
-                if cluster.has_lltf:
-                    complete_clusters_lltf.append(cluster.deserialize_csi_lltf()[board_index] if board_index is not None else cluster.deserialize_csi_lltf())
-                    complete_cluster_timestamps_lltf.append(cluster_timestamps)
-                if cluster.has_ht20ltf:
-                    complete_clusters_ht20.append(cluster.deserialize_csi_ht20ltf()[board_index] if board_index is not None else cluster.deserialize_csi_ht20ltf())
-                    complete_cluster_timestamps_ht20.append(cluster_timestamps)
-                if cluster.has_ht40ltf:
-                    complete_clusters_ht40.append(cluster.deserialize_csi_ht40ltf()[board_index] if board_index is not None else cluster.deserialize_csi_ht40ltf())
-                    complete_cluster_timestamps_ht40.append(cluster_timestamps)
+        # Check completion of all clusters at once: one row of sensor flags per cluster
+        any_csi_count = 0
+        complete_clusters = []
+        if matching_clusters:
+            completions = np.stack([cluster.completion for cluster in matching_clusters])
+            if board_index is not None:
+                completions = completions[:, board_index]
+            completions = completions.reshape(len(matching_clusters), -1)
+            any_csi_count = int(np.count_nonzero(completions.any(axis=1)))
+            complete_clusters = [matching_clusters[i] for i in np.flatnonzero(completions.all(axis=1))]
+
+        # Complete clusters (= reference CSI data from all antennas available) per format: HT40-LTF, HT20-LTF and L-LTF
+        complete_clusters_ht40 = [cluster for cluster in complete_clusters if cluster.has_ht40ltf]
+        complete_clusters_ht20 = [cluster for cluster in complete_clusters if cluster.has_ht20ltf]
+        complete_clusters_lltf = [cluster for cluster in complete_clusters if cluster.has_lltf]
 
         if stale_channel_counts:
             stale_channel_summary = ", ".join(f"primary {primary}, secondary {secondary}: {count}" for (primary, secondary), count in stale_channel_counts.items())
@@ -460,7 +452,7 @@ class CSIPool(Pool):
         self._logger.info(f"  - {len(complete_clusters_ht20)} complete clusters with HT20-LTF")
         self._logger.info(f"  - {len(complete_clusters_lltf)} complete clusters with L-LTF")
 
-        complete_cluster_count = len(complete_cluster_timestamps)
+        complete_cluster_count = len(complete_clusters)
         format_count = len(complete_clusters_lltf) + len(complete_clusters_ht20) + len(complete_clusters_ht40)
         calibration_error = None
         if any_csi_count < 5:
@@ -483,24 +475,35 @@ class CSIPool(Pool):
             )
 
         # Estimate the offsets from the widest available format, since a wider
-        # measurement band yields more accurate timing offsets
+        # measurement band yields more accurate timing offsets. Only the CSI of
+        # that format is deserialized.
         clusters_by_format = {
-            "ht40": (np.asarray(complete_clusters_ht40), np.asarray(complete_cluster_timestamps_ht40)),
-            "ht20": (np.asarray(complete_clusters_ht20), np.asarray(complete_cluster_timestamps_ht20)),
-            "lltf": (np.asarray(complete_clusters_lltf), np.asarray(complete_cluster_timestamps_lltf)),
+            "ht40": (complete_clusters_ht40, csi_cluster.CSICluster.deserialize_csi_ht40ltf),
+            "ht20": (complete_clusters_ht20, csi_cluster.CSICluster.deserialize_csi_ht20ltf),
+            "lltf": (complete_clusters_lltf, csi_cluster.CSICluster.deserialize_csi_lltf),
         }
-        for csi_format, (format_clusters, format_timestamps) in clusters_by_format.items():
-            if len(format_clusters) > 0:
+        for csi_format, (format_cluster_list, deserialize_csi) in clusters_by_format.items():
+            if len(format_cluster_list) > 0:
                 break
 
+        # Per-board calibration only uses that board's data; keep a board axis of length one for the estimation
+        board_slice = slice(None) if board_index is None else slice(board_index, board_index + 1)
+
+        # Copy each cluster's CSI and timestamps straight into one preallocated stack per quantity
+        format_clusters = None
+        format_timestamps = None
+        for cluster_index, cluster in enumerate(format_cluster_list):
+            cluster_csi = deserialize_csi(cluster)[board_slice]
+            cluster_timestamps = cluster.sensor_timestamps[board_slice]
+            if format_clusters is None:
+                format_clusters = np.empty((len(format_cluster_list),) + cluster_csi.shape, dtype=cluster_csi.dtype)
+                format_timestamps = np.empty((len(format_cluster_list),) + cluster_timestamps.shape, dtype=cluster_timestamps.dtype)
+            format_clusters[cluster_index] = cluster_csi
+            format_timestamps[cluster_index] = cluster_timestamps
+
         self._logger.info(f"Estimating calibration offsets from {len(format_clusters)} {csi_format} cluster(s)")
         frequencies, valid = csi_processing.get_csi_sto_correction_frequencies(csi_format, channel_secondary)
 
-        # Per-board calibration data has no board axis; add and remove it around the estimation
-        if board_index is not None:
-            format_clusters = format_clusters[:, np.newaxis]
-            format_timestamps = format_timestamps[:, np.newaxis]
-
         timing_offsets, phase_offsets = csi_processing.estimate_phase_time_offsets(format_clusters, format_timestamps, frequencies, valid)
         if board_index is not None:
             timing_offsets, phase_offsets = timing_offsets[0], phase_offsets[0]
@@ -573,13 +576,15 @@ class CSIPool(Pool):
             channel_primary = None
             channel_secondary = None
 
+            # Query the Wi-Fi config once, it is the same for all boards
+            wifi_config = self.get_wifi_config()
             for board_index in range(len(self.boards)):
                 (
                     board_timing_offsets,
                     board_phase_offsets,
                     board_channel_primary,
                     board_channel_secondary,
-                ) = self._clusters_to_calibration(board_index)
+                ) = self._clusters_to_calibration(board_index, wifi_config)
 
                 if channel_primary is None:
                     channel_primary = board_channel_primary
@@ -641,22 +646,26 @@ class CSIPool(Pool):
         self,
         board_index: int,
         sensor_message: sensor.SensorMessage,
-    ) -> wifi.WiFiFrameKey:
-        return wifi.WiFiFrameKey.from_packet(sensor_message.payload)
+    ) -> tuple:
+        # A plain tuple of the WiFiFrameKey fields hashes and compares in C; the
+        # (frozen dataclass) frame key itself is only built once per new cluster
+        packet = sensor_message.payload
+        sequence_control = packet.sequence_control
+        return (packet.source_mac, packet.destination_mac, sequence_control.seg, sequence_control.frag, packet.is_retry)
 
     def _create_cluster(
         self,
         cache_name: str,
-        cluster_key: wifi.WiFiFrameKey,
+        cluster_key: tuple,
         board_index: int,
         first_message: sensor.SensorMessage,
     ) -> csi_cluster.CSICluster:
-        return csi_cluster.CSICluster(cluster_key, self.board_revisions)
+        return csi_cluster.CSICluster(wifi.WiFiFrameKey(*cluster_key), self.board_revisions)
 
     def _on_cluster_updated(
         self,
         cache_name: str,
-        cluster_key: wifi.WiFiFrameKey,
+        cluster_key: tuple,
         sensor_cluster: SensorCluster,
     ) -> bool:
         if not isinstance(sensor_cluster, csi_cluster.CSICluster):
@@ -668,7 +677,10 @@ class CSIPool(Pool):
             return False
 
         all_callbacks_fired = self._try_callbacks(sensor_cluster)
-        return all_callbacks_fired and np.any(sensor_cluster.completion)
+        return all_callbacks_fired and sensor_cluster._completion_count > 0
 
     def _get_cluster_cache_timeout(self, cache_name: str) -> float | None:
         return self._ota_cache_timeout if cache_name == _CACHE_OTA else None
+
+    def _get_cluster_cache_size_limit(self, cache_name: str) -> int | None:
+        return self._ota_cache_size if cache_name == _CACHE_OTA else None
@@ -8,6 +8,8 @@ subcarrier frequency grids, calibration derivation, timing conditioning,
 coherent combining of repeated CSI snapshots, and RF-switch feed separation.
 """
 
+import functools
+
 import numpy as np
 
 from . import constants
@@ -63,6 +65,14 @@ def _reported_gain_to_signed(gain: np.ndarray) -> np.ndarray:
     return np.where((gain >= 128.0) & (gain <= 255.0), gain - 256.0, gain)
 
 
+def _interpolate_gap(csi: np.ndarray, index_left: int, index_right: int) -> None:
+    """Linearly interpolate the subcarriers strictly between two valid subcarriers in place along the last axis."""
+    left = csi[..., index_left, np.newaxis]
+    right = csi[..., index_right, np.newaxis]
+    interp = np.arange(1, index_right - index_left) / (index_right - index_left)
+    csi[..., index_left + 1 : index_right] = interp * right + (1 - interp) * left
+
+
 def interpolate_lltf_gap(csi_lltf: np.ndarray) -> None:
     """
     Fill the L-LTF DC subcarrier by linear interpolation in place.
@@ -97,11 +107,7 @@ def interpolate_ht40ltf_gap(csi_ht40: np.ndarray) -> None:
     """
     index_left = csi_packet.HT_COEFFICIENTS_PER_CHANNEL - 1
     index_right = csi_packet.HT_COEFFICIENTS_PER_CHANNEL + csi_packet.HT40_GAP_SUBCARRIERS
-    missing_indices = np.arange(index_left + 1, index_right)
-    left = csi_ht40[..., index_left]
-    right = csi_ht40[..., index_right]
-    interp = (missing_indices - index_left) / (index_right - index_left)
-    csi_ht40[..., missing_indices] = interp * right[..., np.newaxis] + (1 - interp) * left[..., np.newaxis]
+    _interpolate_gap(csi_ht40, index_left, index_right)
 
 
 def interpolate_he20ltf_gaps(csi_he20: np.ndarray) -> None:
@@ -113,13 +119,17 @@ def interpolate_he20ltf_gaps(csi_he20: np.ndarray) -> None:
         ascending order ``-122..122``. Any leading dimensions are preserved.
     """
     center_index = csi_packet.HE20_COEFFICIENTS_PER_CHANNEL // 2
-    index_left = center_index - 2
-    index_right = center_index + 2
-    missing_indices = np.arange(index_left + 1, index_right)
-    left = csi_he20[..., index_left]
-    right = csi_he20[..., index_right]
-    interp = (missing_indices - index_left) / (index_right - index_left)
-    csi_he20[..., missing_indices] = interp * right[..., np.newaxis] + (1 - interp) * left[..., np.newaxis]
+    _interpolate_gap(csi_he20, center_index - 2, center_index + 2)
+
+
+# Subcarrier slices of the narrower formats within wider CSI, computed once at import
+_LLTF_IN_HT20 = (csi_packet.HT_COEFFICIENTS_PER_CHANNEL - csi_packet.LEGACY_COEFFICIENTS_PER_CHANNEL) // 2
+_UPPER_HT20_IN_HT40 = csi_packet.HT_COEFFICIENTS_PER_CHANNEL + csi_packet.HT40_GAP_SUBCARRIERS
+_LLTF_SLICE_FROM_HT20 = slice(_LLTF_IN_HT20, _LLTF_IN_HT20 + csi_packet.LEGACY_COEFFICIENTS_PER_CHANNEL)
+_LLTF_SLICE_FROM_HT40_BELOW = _LLTF_SLICE_FROM_HT20
+_LLTF_SLICE_FROM_HT40_ABOVE = slice(_UPPER_HT20_IN_HT40 + _LLTF_IN_HT20, _UPPER_HT20_IN_HT40 + _LLTF_IN_HT20 + csi_packet.LEGACY_COEFFICIENTS_PER_CHANNEL)
+_HT20_SLICE_FROM_HT40_BELOW = slice(0, csi_packet.HT_COEFFICIENTS_PER_CHANNEL)
+_HT20_SLICE_FROM_HT40_ABOVE = slice(_UPPER_HT20_IN_HT40, _UPPER_HT20_IN_HT40 + csi_packet.HT_COEFFICIENTS_PER_CHANNEL)
 
 
 def extract_lltf_subcarriers_from_ht40(csi_ht40: np.ndarray, secondary_channel_relative: int):
@@ -131,15 +141,8 @@ def extract_lltf_subcarriers_from_ht40(csi_ht40: np.ndarray, secondary_channel_r
 
     :return: The extracted LLTF CSI data. Complex-valued NumPy array with shape (datapoints, arrays, rows, columns, subcarriers).
     """
-    base_offset = (csi_packet.HT_COEFFICIENTS_PER_CHANNEL - csi_packet.LEGACY_COEFFICIENTS_PER_CHANNEL) // 2
-    if secondary_channel_relative == -1:
-        # Secondary channel is below primary channel
-        start_index = base_offset
-    else:
-        # Secondary channel is above primary channel
-        start_index = base_offset + csi_packet.HT_COEFFICIENTS_PER_CHANNEL + csi_packet.HT40_GAP_SUBCARRIERS
-
-    return csi_ht40[..., start_index : start_index + csi_packet.LEGACY_COEFFICIENTS_PER_CHANNEL]
+    # Secondary channel below primary channel selects the lower half, otherwise the upper half
+    return csi_ht40[..., _LLTF_SLICE_FROM_HT40_BELOW if secondary_channel_relative == -1 else _LLTF_SLICE_FROM_HT40_ABOVE]
 
 
 def extract_ht20_subcarriers_from_ht40(csi_ht40: np.ndarray, secondary_channel_relative: int):
@@ -151,14 +154,8 @@ def extract_ht20_subcarriers_from_ht40(csi_ht40: np.ndarray, secondary_channel_r
 
     :return: The extracted HT20 CSI data. Complex-valued NumPy array with shape (datapoints, arrays, rows, columns, subcarriers).
     """
-    if secondary_channel_relative == -1:
-        # Secondary channel is below primary channel
-        start_index = 0
-    else:
-        # Secondary channel is above primary channel
-        start_index = csi_packet.HT_COEFFICIENTS_PER_CHANNEL + csi_packet.HT40_GAP_SUBCARRIERS
-
-    return csi_ht40[..., start_index : start_index + csi_packet.HT_COEFFICIENTS_PER_CHANNEL]
+    # Secondary channel below primary channel selects the lower half, otherwise the upper half
+    return csi_ht40[..., _HT20_SLICE_FROM_HT40_BELOW if secondary_channel_relative == -1 else _HT20_SLICE_FROM_HT40_ABOVE]
 
 
 def extract_lltf_subcarriers_from_ht20(csi_ht20: np.ndarray):
@@ -169,9 +166,7 @@ def extract_lltf_subcarriers_from_ht20(csi_ht20: np.ndarray):
 
     :return: The extracted LLTF CSI data. Complex-valued NumPy array with shape (datapoints, arrays, rows, columns, subcarriers).
     """
-    start_index = (csi_packet.HT_COEFFICIENTS_PER_CHANNEL - csi_packet.LEGACY_COEFFICIENTS_PER_CHANNEL) // 2
-
-    return csi_ht20[..., start_index : start_index + csi_packet.LEGACY_COEFFICIENTS_PER_CHANNEL]
+    return csi_ht20[..., _LLTF_SLICE_FROM_HT20]
 
 
 def get_frequencies_ht40(primary_channel: int, secondary_channel: int):
@@ -269,11 +264,19 @@ def get_csi_sto_correction_frequencies(csi_format: str, secondary_channel_relati
         boolean validity mask (False for gap / invalid subcarriers that carry
         no usable CSI, e.g. the HT40 gap).
     """
+    try:
+        return _STO_CORRECTION_FREQUENCIES[(csi_format, secondary_channel_relative)]
+    except KeyError:
+        # Unknown formats and invalid channel bonding combinations raise here
+        return _compute_csi_sto_correction_frequencies(csi_format, secondary_channel_relative)
+
+
+def _compute_csi_sto_correction_frequencies(csi_format: str, secondary_channel_relative: int) -> tuple[np.ndarray, np.ndarray]:
     indices = csi_packet.get_csi_format_subcarrier_indices(csi_format).astype(np.float64)
     valid = np.ones(len(indices), dtype=bool)
 
     if csi_format in ("lltf", "ht20"):
-        indices = indices - secondary_channel_relative * int(2 * constants.WIFI_CHANNEL_SPACING / constants.WIFI_SUBCARRIER_SPACING)
+        indices = indices - secondary_channel_relative * constants.SUBCARRIERS_PER_CHANNEL
         frequencies = indices * constants.WIFI_SUBCARRIER_SPACING
     elif csi_format == "ht40":
         frequencies = indices * constants.WIFI_SUBCARRIER_SPACING
@@ -290,6 +293,22 @@ def get_csi_sto_correction_frequencies(csi_format: str, secondary_channel_relati
     return frequencies, valid
 
 
+def _precompute_csi_sto_correction_frequencies() -> dict:
+    grids = {}
+    for csi_format in ("lltf", "ht20", "ht40", "he20"):
+        for secondary_channel_relative in (0,) if csi_format == "he20" else (-1, 0, 1):
+            frequencies, valid = _compute_csi_sto_correction_frequencies(csi_format, secondary_channel_relative)
+            # Shared between all callers, so guard against accidental modification
+            frequencies.flags.writeable = False
+            valid.flags.writeable = False
+            grids[(csi_format, secondary_channel_relative)] = (frequencies, valid)
+    return grids
+
+
+# STO correction grids for all formats and channel bonding configurations, computed once at import
+_STO_CORRECTION_FREQUENCIES = _precompute_csi_sto_correction_frequencies()
+
+
 def estimate_phase_time_offsets(
     complete_clusters: np.ndarray,
     complete_cluster_timestamps: np.ndarray,
@@ -353,8 +372,8 @@ def estimate_phase_time_offsets(
         raise ValueError("subcarrier_frequencies must be uniformly spaced across valid subcarriers")
 
     # Undo the timestamp-based STO correction from deserialization
-    sto_delay_correction = np.exp(1.0j * 2 * np.pi * complete_cluster_timestamps[:, :, :, :, np.newaxis] * frequencies)
-    csi_raw = np.einsum("cbras,cbras->cbras", csi_sto_corrected, sto_delay_correction)
+    csi_raw = np.exp(1.0j * 2 * np.pi * complete_cluster_timestamps[:, :, :, :, np.newaxis] * frequencies)
+    csi_raw *= csi_sto_corrected
 
     # Determine the STO of each cluster from the raw phase slope across the grid
     incr = (csi_raw[..., 1:] * np.conj(csi_raw[..., :-1]))[..., pair_valid]
@@ -369,8 +388,8 @@ def estimate_phase_time_offsets(
 
     # Constant per-antenna phase offsets in the slope-free domain
     mean_response = csi_interp_eigenvec_per_subcarrier(csi_sto_corrected[..., valid])
-    timing_slope = np.exp(-1.0j * 2.0 * np.pi * mean_rx_baseband_sto[..., np.newaxis] * frequencies[valid])
-    residual = mean_response * np.conj(timing_slope)
+    inverse_timing_slope = np.exp(1.0j * 2.0 * np.pi * mean_rx_baseband_sto[..., np.newaxis] * frequencies[valid])
+    residual = mean_response * inverse_timing_slope
     residual_sum = np.sum(residual, axis=-1)
     antenna_phase_offsets = residual_sum / np.maximum(np.abs(residual_sum), 1e-12)
     antenna_phase_offsets = antenna_phase_offsets * np.conj(antenna_phase_offsets[0:1, 0:1, 0:1] / np.abs(antenna_phase_offsets[0:1, 0:1, 0:1]))
@@ -378,6 +397,23 @@ def estimate_phase_time_offsets(
     return mean_rx_baseband_sto, antenna_phase_offsets
 
 
+@functools.lru_cache(maxsize=16)
+def _subcarrier_range(subcarrier_count: int) -> np.ndarray:
+    """Return the subcarrier index range centered on the DC subcarrier, shared read-only between callers."""
+    subcarrier_range = np.arange(-subcarrier_count // 2, subcarrier_count // 2) + 1
+    subcarrier_range.flags.writeable = False
+    return subcarrier_range
+
+
+@functools.lru_cache(maxsize=16)
+def _build_shift_vectors(subcarrier_count: int, max_delay_taps: float, search_resolution: int) -> np.ndarray:
+    """Return the frequency-domain time shift vectors searched by :func:`shift_to_firstpeak_sync`, shared read-only between callers."""
+    shifts = np.linspace(-max_delay_taps, 0, search_resolution)
+    shift_vectors = np.exp(1.0j * np.outer(shifts, 2 * np.pi * _subcarrier_range(subcarrier_count) / subcarrier_count))
+    shift_vectors.flags.writeable = False
+    return shift_vectors
+
+
 def remove_mean_sto(csi_datapoints: np.ndarray):
     """
     Removes the mean symbol timing offset (STO) from the CSI data by estimating the STO from the phase slope across subcarriers.
@@ -395,7 +431,7 @@ def remove_mean_sto(csi_datapoints: np.ndarray):
             axis=sum_axes,
         )
     )
-    subcarrier_range = np.arange(-csi_datapoints.shape[-1] // 2, csi_datapoints.shape[-1] // 2) + 1
+    subcarrier_range = _subcarrier_range(csi_datapoints.shape[-1])
 
     # Reshape for broadcasting: (datapoints, 1, 1, ..., 1, subcarriers)
     correction_shape = (csi_datapoints.shape[0],) + (1,) * (csi_datapoints.ndim - 2) + (subcarrier_range.shape[0],)
@@ -423,13 +459,10 @@ def shift_to_firstpeak_sync(
     """
     # Time-shift all collected CSI so that first "peak" is at time 0
     # CSI datapoints has shape (datapoints, arrays, rows, columns, subcarriers)
-    shifts = np.linspace(-max_delay_taps, 0, search_resolution)
-    subcarrier_range = np.arange(-csi_datapoints.shape[-1] // 2, csi_datapoints.shape[-1] // 2) + 1
-    shift_vectors = np.exp(1.0j * np.outer(shifts, 2 * np.pi * subcarrier_range / csi_datapoints.shape[-1]))
-    powers_by_delay = np.sum(
-        np.abs(np.einsum("lbrms,ds->lbrmd", csi_datapoints, shift_vectors)) ** 2,
-        axis=(1, 2, 3),
-    )
+    shift_vectors = _build_shift_vectors(csi_datapoints.shape[-1], max_delay_taps, search_resolution)
+    # Squared magnitude from real and imaginary parts, avoids a square root per delay and antenna
+    shifted = np.einsum("lbrms,ds->lbrmd", csi_datapoints, shift_vectors, optimize=True)
+    powers_by_delay = np.sum(shifted.real**2 + shifted.imag**2, axis=(1, 2, 3))
     max_peaks = np.max(powers_by_delay, axis=-1)
     first_peak = np.argmax(powers_by_delay > peak_threshold * max_peaks[:, np.newaxis], axis=-1)
     shift_to_firstpeak = shift_vectors[first_peak]
@@ -456,12 +489,15 @@ def csi_interp_iterative(csi: np.ndarray, weights: np.ndarray = None, iterations
     if weights is None:
         weights = np.ones(len(csi), dtype=csi.dtype) / len(csi)
 
+    # Both steps are matrix-vector products with the datapoints as matrix rows
+    csi_flat = csi.reshape(len(csi), -1)
     phi = np.zeros_like(weights, dtype=csi.dtype)
     w = None
 
     for i in range(iterations):
-        w = np.einsum("n,n,n...->...", weights, np.exp(-1.0j * phi), csi)
-        phi = np.angle(np.einsum("a,na->n", np.conj(w.flatten()), csi.reshape(len(csi), -1)))
+        w_flat = (weights * np.exp(-1.0j * phi)) @ csi_flat
+        phi = np.angle(csi_flat @ np.conj(w_flat))
+        w = w_flat.reshape(csi.shape[1:])
         # err = np.sum([weights[n] * np.linalg.norm(csi[n] - np.exp(1.0j * phi[n]) * w)**2 for n in range(len(csi))])
 
     return w
@@ -474,8 +510,18 @@ def csi_interp_iterative_by_array(csi: np.ndarray, weights: np.ndarray = None, i
     """
     csi_interp = np.zeros((csi.shape[1], *csi.shape[2:]), dtype=csi.dtype)
 
-    for b in range(csi.shape[1]):
-        csi_interp[b] = csi_interp_iterative(csi[:, b], weights=weights, iterations=iterations)
+    if weights is None:
+        weights = np.ones(len(csi), dtype=csi.dtype) / len(csi)
+
+    # Same iteration as csi_interp_iterative, with the matrix-vector products batched over arrays:
+    # csi_by_array has shape (arrays, datapoints, antennas * subcarriers), phi has shape (arrays, datapoints)
+    csi_by_array = np.swapaxes(csi.reshape(csi.shape[0], csi.shape[1], -1), 0, 1)
+    phi = np.zeros((csi.shape[1], len(csi)), dtype=csi.dtype)
+
+    for i in range(iterations):
+        w_flat = ((weights * np.exp(-1.0j * phi))[:, np.newaxis, :] @ csi_by_array)[:, 0, :]
+        phi = np.angle(csi_by_array @ np.conj(w_flat)[:, :, np.newaxis])[:, :, 0]
+        csi_interp = w_flat.reshape(csi_interp.shape)
 
     return csi_interp
 
@@ -502,20 +548,21 @@ def csi_interp_eigenvec_per_subcarrier(csi: np.ndarray) -> np.ndarray:
     csi_flat = csi.reshape(csi.shape[0], -1, n_subcarriers)
 
     # Per-subcarrier covariance matrix: (n_subcarriers, n_antennas, n_antennas)
-    R = np.einsum("nas,nbs->sab", csi_flat, np.conj(csi_flat))
+    R = np.einsum("nas,nbs->sab", csi_flat, np.conj(csi_flat), optimize=True)
 
-    # Eigendecomposition, sort by eigenvalue magnitude (descending)
-    eigvals, eigvecs = np.linalg.eig(R)
-    idx = np.argsort(np.abs(eigvals), axis=1)[:, ::-1]
-    eigvals = np.take_along_axis(eigvals, idx, axis=1)
-    eigvecs = np.take_along_axis(eigvecs, idx[:, np.newaxis, :], axis=2)
+    # R is Hermitian, so eigh applies and returns real eigenvalues in ascending order
+    eigvals, eigvecs = np.linalg.eigh(R)
 
     # Extract principal eigenvector and eigenvalue
-    principal_eigenvectors = eigvecs[:, :, 0]
-    principal_eigenvalues = eigvals[:, 0]
+    principal_eigenvectors = eigvecs[:, :, -1]
+    principal_eigenvalues = eigvals[:, -1]
 
-    # Scale by sqrt of eigenvalue and use antenna 0 as phase reference
-    result_flat = np.sqrt(principal_eigenvalues)[:, np.newaxis] * principal_eigenvectors * np.exp(-1.0j * np.angle(principal_eigenvectors[:, 0][:, np.newaxis]))
+    # Scale by sqrt of eigenvalue and use antenna 0 as phase reference. The reference
+    # phasor exp(-j * angle(z)) equals conj(z) / |z|, which needs no transcendentals.
+    reference = principal_eigenvectors[:, 0][:, np.newaxis]
+    reference_magnitude = np.abs(reference)
+    reference_phasor = np.divide(np.conj(reference), reference_magnitude, out=np.ones_like(reference), where=reference_magnitude > 0)
+    result_flat = np.sqrt(principal_eigenvalues)[:, np.newaxis] * principal_eigenvectors * reference_phasor
 
     # Swap from (n_subcarriers, n_antennas) to (n_antennas, n_subcarriers) and reshape
     result_flat = np.swapaxes(result_flat, 0, 1)
@@ -534,13 +581,12 @@ def csi_interp_eigenvec(csi: np.ndarray, weights: np.ndarray = None):
 
     csi_shape = csi.shape[1:]
     csi = np.reshape(csi, (csi.shape[0], -1))
-    R = np.einsum("n,na,nb->ab", weights, csi, np.conj(csi))
+    R = np.einsum("n,na,nb->ab", weights, csi, np.conj(csi), optimize=True)
 
-    # eig is faster than eigh for small matrices like the one here
-    w, v = np.linalg.eig(R)
-    principal = np.argmax(w)
+    # R is Hermitian, so eigh applies and returns eigenvalues in ascending order
+    _, v = np.linalg.eigh(R)
 
-    return np.reshape(v[:, principal], csi_shape)
+    return np.reshape(v[:, -1], csi_shape)
 
 
 def fit_complex_sinusoid(csi_data: np.ndarray) -> np.ndarray:
@@ -572,12 +618,14 @@ def fit_complex_sinusoid(csi_data: np.ndarray) -> np.ndarray:
     phase_diff = csi_data[..., 1:] * np.conj(csi_data[..., :-1])
     omega = np.angle(np.sum(phase_diff, axis=-1))  # (*antenna_shape,)
 
+    # The unit-magnitude phase ramp is needed twice: conjugated to remove the phase slope, and as is to reconstruct
+    phase_ramp = np.exp(1.0j * omega[..., np.newaxis] * k)
+
     # Remove phase slope to estimate amplitude and phase offset
-    derotated = csi_data * np.exp(-1.0j * omega[..., np.newaxis] * k)
-    complex_amplitude = np.mean(derotated, axis=-1)  # A * exp(j * phi_0)
+    complex_amplitude = np.mean(csi_data * np.conj(phase_ramp), axis=-1)  # A * exp(j * phi_0)
 
     # Reconstruct fitted sinusoid
-    fitted = complex_amplitude[..., np.newaxis] * np.exp(1.0j * omega[..., np.newaxis] * k)
+    fitted = complex_amplitude[..., np.newaxis] * phase_ramp
     return fitted
 
 
@@ -590,14 +638,22 @@ def mask_csi_by_feed(csi_data: np.ndarray, rf_switch_states: np.ndarray, desired
     :param rf_switch_states: The RF switch states for each antenna and datapoint. NumPy array with shape (datapoints, ...), usually (datapoints, arrays, rows, columns).
     :param desired_feed: The desired RF switch state to keep.
 
-    :return: The masked CSI data. Complex-valued NumPy array with the same shape as the input CSI data. Returns None if no datapoints have the desired RF switch state for any antenna.
+    :return: The masked CSI data. Complex-valued NumPy array with the same shape and dtype as the input CSI data. Returns None if no datapoints have the desired RF switch state for any antenna.
     """
     mask = rf_switch_states == desired_feed
     mask_count = np.sum(mask, axis=0)
     datapoint_count = csi_data.shape[0]
     if np.any(mask_count == 0):
         return None
-    return csi_data * mask[..., np.newaxis] * datapoint_count / mask_count[np.newaxis, ..., np.newaxis]
+
+    # Every datapoint has the desired feed, so the scale is exactly one and a plain copy suffices
+    if np.all(mask_count == datapoint_count):
+        return csi_data.copy()
+
+    # Fold mask and power scaling into one factor per datapoint and antenna, so the CSI is only traversed once.
+    # The factor has the precision of the CSI data, so complex64 input is not promoted to complex128.
+    scale = (mask * (datapoint_count / mask_count)).astype(csi_data.real.dtype)
+    return csi_data * scale[..., np.newaxis]
 
 
 def separate_feeds(csi_data: np.ndarray, rf_switch_state: np.ndarray):
@@ -609,13 +665,14 @@ def separate_feeds(csi_data: np.ndarray, rf_switch_state: np.ndarray):
     :param csi_data: The CSI data to separate. Complex-valued NumPy array with shape (datapoints, ..., subcarriers), usually (datapoints, arrays, rows, columns, subcarriers).
     :param rf_switch_state: The RF switch states for each antenna and datapoint. NumPy array with shape (datapoints, ...), usually (datapoints, arrays, rows, columns).
 
-    :return: The separated CSI data. Complex-valued NumPy array with shape (datapoints, ..., subcarriers, 2), where the last dimension corresponds to the R/L feeds. Returns None if no datapoints have the desired RF switch state for any antenna.
+    :return: The separated CSI data. Complex-valued NumPy array with shape (datapoints, ..., subcarriers, 2) and the dtype of the input CSI data, where the last dimension corresponds to the R/L feeds. Returns None if no datapoints have the desired RF switch state for any antenna.
     """
-    csi_r = mask_csi_by_feed(csi_data, rf_switch_state, sensor.RFSwitchState.SENSOR_RFSWITCH_ANTENNA_R)
-    csi_l = mask_csi_by_feed(csi_data, rf_switch_state, sensor.RFSwitchState.SENSOR_RFSWITCH_ANTENNA_L)
-
-    if csi_r is None or csi_l is None:
+    feeds = np.array([sensor.RFSwitchState.SENSOR_RFSWITCH_ANTENNA_R, sensor.RFSwitchState.SENSOR_RFSWITCH_ANTENNA_L])
+    masks = rf_switch_state[..., np.newaxis] == feeds  # (D, ..., 2)
+    mask_counts = np.sum(masks, axis=0)
+    if np.any(mask_counts == 0):
         return None
 
-    # Separate CSI by feed using element-wise multiplication (zeros where mask is False)
-    return np.stack([csi_r, csi_l], axis=-1)  # (D, ..., S, 2), usually (D, B, M, N, S, 2)
+    # Same per-feed scaling as mask_csi_by_feed, but both feeds are written in one pass over the CSI data
+    scale = (masks * (csi_data.shape[0] / mask_counts)).astype(csi_data.real.dtype)
+    return csi_data[..., np.newaxis] * scale[..., np.newaxis, :]  # (D, ..., S, 2), usually (D, B, M, N, S, 2)
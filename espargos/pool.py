@@ -18,9 +18,11 @@ provide the cache, key, and cluster behavior for the messages they support.
 
 from abc import ABC, abstractmethod
 from collections.abc import Callable, Hashable
-from weakref import WeakKeyDictionary
+from typing import TypeVar
+import concurrent.futures
 import json
 import logging
+import operator
 import queue
 import threading
 import time
@@ -37,6 +39,45 @@ _PROCESSING_RUN_TIMEOUT = 0.5
 _RUN_BATCH_BOUNDARY = object()
 _CLUSTER_COLLISION_WARNING_INTERVAL = 5.0
 
+_BoardResultT = TypeVar("_BoardResultT")
+
+
+def _canonical_board_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return value
+
+
+def _board_values_identical(value, reference) -> bool:
+    """Check whether two decoded JSON values are equal with identical types throughout.
+
+    Values accepted here encode to the same canonical JSON. Anything else
+    (e.g. :code:`True` vs. :code:`1`, :code:`1` vs. :code:`1.0`, non-string
+    dict keys) returns False and is left to the canonical JSON comparison.
+    """
+
+    if type(value) is not type(reference):
+        return False
+    if isinstance(value, dict):
+        return value.keys() == reference.keys() and all(type(key) is str and _board_values_identical(item, reference[key]) for key, item in value.items())
+    if isinstance(value, list):
+        return len(value) == len(reference) and all(map(_board_values_identical, value, reference))
+    return value == reference
+
+
+def _board_values_differ(value, reference) -> bool:
+    """Compare two board responses, dicts and lists as canonical JSON.
+
+    Values that are identical down to their types are accepted without
+    encoding anything; all others are compared as canonical JSON, so that
+    JSON type differences (booleans vs. integers, integers vs. floats) are
+    reported as mismatches while dict key order is ignored.
+    """
+
+    if _board_values_identical(value, reference):
+        return False
+    return _canonical_board_value(value) != _canonical_board_value(reference)
+
 
 class _ClusterCallback(object):
     """One registered cluster-completion callback and its fired-state tracking."""
@@ -46,33 +87,25 @@ class _ClusterCallback(object):
         callback: Callable[[SensorCluster], None],
         callback_predicate: Callable[[SensorCluster], bool] = None,
     ):
-        # By default, emit a cluster once every sensor has contributed to it
-        self._callback_predicate = callback_predicate
+        # By default, emit a cluster once every sensor has contributed to it. The
+        # choice is made once here, so each offered cluster costs a single call.
+        self._callback_predicate = callback_predicate if callback_predicate is not None else operator.attrgetter("is_complete")
         self._callback = callback
 
-        # Track fired state per cluster object
-        self._fired = WeakKeyDictionary()
-
     def _try_call(self, cluster_obj: SensorCluster):
-        # Check if callback has already been fired for this cluster object
-        if self._fired.get(cluster_obj, False):
+        # Check if callback has already been fired for this cluster object. The
+        # fired state lives on the cluster, so it is dropped together with it.
+        if self in cluster_obj._fired_callbacks:
             return True
 
-        # Check if callback needs to be called: Use predicate function if defined, otherwise call if cluster is complete
-        callback_required = False
-        if self._callback_predicate is not None:
-            callback_required = self._callback_predicate(cluster_obj)
-        else:
-            callback_required = cluster_obj.is_complete
+        if not self._callback_predicate(cluster_obj):
+            return False
 
-        if callback_required:
-            self._callback(cluster_obj)
+        self._callback(cluster_obj)
 
-            # Mark as fired for this cluster object
-            self._fired[cluster_obj] = True
-            return True
-
-        return False
+        # Mark as fired for this cluster object
+        cluster_obj._fired_callbacks.add(self)
+        return True
 
 
 class Pool(ABC):
@@ -91,15 +124,22 @@ class Pool(ABC):
         self._logger = logging.getLogger(f"pyespargos.{module_name}")
         self.boards = list(boards)
         self.board_revisions = tuple(board_obj.revision for board_obj in self.boards)
+        self._shape = (
+            len(self.boards),
+            constants.ROWS_PER_BOARD,
+            constants.ANTENNAS_PER_ROW,
+        )
 
-        self._input_queue = queue.Queue()
+        # Unbounded C-implemented FIFO: board receive threads enqueue without taking a Python-level lock
+        self._input_queue = queue.SimpleQueue()
         self._run_lock = threading.Lock()
         self._cluster_lock = threading.Lock()
         self._cluster_caches: dict[str, dict[Hashable, SensorCluster]] = {}
         self._sensor_message_subscriptions: list[tuple[board.BoardCapability, board.SensorMessageSubscription]] = []
         self._cluster_collisions_since_warning = 0
         self._last_cluster_collision_warning: float | None = None
-        self._cluster_callbacks: list[_ClusterCallback] = []
+        # Replaced as a whole under the lock, so completion checks can read it without locking
+        self._cluster_callbacks: tuple[_ClusterCallback, ...] = ()
         self._cluster_callbacks_lock = threading.Lock()
         self._processing_thread: threading.Thread | None = None
         self._processing_lock = threading.Lock()
@@ -121,6 +161,26 @@ class Pool(ABC):
         subscription = subscribe(enqueue)
         self._sensor_message_subscriptions.append((capability, subscription))
 
+    def _map_boards(
+        self,
+        function: Callable[[board.Board], _BoardResultT],
+        boards: list[board.Board] | None = None,
+    ) -> list[_BoardResultT]:
+        """Call ``function`` for every board concurrently and return the results in board order.
+
+        Board requests are round trips to independent controllers, so issuing
+        them in parallel makes a pool-wide operation take about as long as the
+        slowest board rather than the sum over all boards. If a call raises,
+        the first exception in board order is propagated after all calls have
+        finished.
+        """
+
+        boards = self.boards if boards is None else boards
+        if len(boards) <= 1:
+            return [function(board_obj) for board_obj in boards]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(boards)) as executor:
+            return list(executor.map(function, boards))
+
     def start(self):
         """Start sensor-message reception on every board.
 
@@ -210,7 +270,7 @@ class Pool(ABC):
 
         callback_handle = _ClusterCallback(callback, callback_predicate)
         with self._cluster_callbacks_lock:
-            self._cluster_callbacks.append(callback_handle)
+            self._cluster_callbacks += (callback_handle,)
         return callback_handle
 
     def remove_cluster_callback(self, callback: _ClusterCallback) -> bool:
@@ -221,11 +281,10 @@ class Pool(ABC):
         """
 
         with self._cluster_callbacks_lock:
-            try:
-                self._cluster_callbacks.remove(callback)
-                return True
-            except ValueError:
+            if callback not in self._cluster_callbacks:
                 return False
+            self._cluster_callbacks = tuple(entry for entry in self._cluster_callbacks if entry is not callback)
+            return True
 
     def replace_cluster_callback(
         self,
@@ -248,16 +307,15 @@ class Pool(ABC):
                 index = self._cluster_callbacks.index(callback)
             except ValueError:
                 raise ValueError("Cluster callback is not registered") from None
-            self._cluster_callbacks[index] = replacement
+            self._cluster_callbacks = self._cluster_callbacks[:index] + (replacement,) + self._cluster_callbacks[index + 1 :]
         return replacement
 
     def _try_callbacks(self, cluster_obj: SensorCluster) -> bool:
         """Offer a cluster to every registered callback; return whether all have fired."""
 
+        # Every callback is offered the cluster, even after one has declined it
         all_callbacks_fired = True
-        with self._cluster_callbacks_lock:
-            callbacks = tuple(self._cluster_callbacks)
-        for callback in callbacks:
+        for callback in self._cluster_callbacks:
             callback_fired = callback._try_call(cluster_obj)
             all_callbacks_fired = callback_fired and all_callbacks_fired
         return all_callbacks_fired
@@ -272,11 +330,7 @@ class Pool(ABC):
     def shape(self) -> tuple[int, int, int]:
         """Return the logical ``(board, row, column)`` sensor-array shape."""
 
-        return (
-            len(self.boards),
-            constants.ROWS_PER_BOARD,
-            constants.ANTENNAS_PER_ROW,
-        )
+        return self._shape
 
     def run(self, timeout: float | None = _DEFAULT_RUN_TIMEOUT) -> int:
         """Process one bounded batch of pending sensor messages.
@@ -344,6 +398,7 @@ class Pool(ABC):
         cluster_key = self._get_cluster_key(board_index, sensor_message)
 
         collision = None
+        evicted = None
         with self._cluster_lock:
             cache = self._cluster_caches.setdefault(cache_name, {})
             sensor_cluster = cache.get(cluster_key)
@@ -356,11 +411,19 @@ class Pool(ABC):
                 )
                 cache[cluster_key] = sensor_cluster
 
+                # Caches are ordered by age, so a full cache evicts its oldest cluster
+                size_limit = self._get_cluster_cache_size_limit(cache_name)
+                if size_limit is not None and len(cache) > size_limit:
+                    evicted_key = next(iter(cache))
+                    evicted = (evicted_key, cache.pop(evicted_key))
+
             try:
                 changed = sensor_cluster.add_message(board_index, sensor_message)
             except ClusterCollisionError as error:
                 collision = error
 
+        if evicted is not None:
+            self._on_cluster_expired(cache_name, *evicted)
         if collision is not None:
             self._warn_cluster_collision(cache_name, cluster_key, collision)
             return None
@@ -380,22 +443,25 @@ class Pool(ABC):
                 cache.pop(cluster_key)
 
     def _expire_cluster_caches(self) -> None:
-        with self._cluster_lock:
-            cache_names = tuple(self._cluster_caches)
-
-        cache_timeouts = {cache_name: timeout for cache_name in cache_names if (timeout := self._get_cluster_cache_timeout(cache_name)) is not None}
-        if not cache_timeouts:
-            return
-
         # Only inspect expiring caches. In particular, retained calibration
         # clusters can be numerous and must not be copied on every run() call.
         expired: list[tuple[str, Hashable, SensorCluster]] = []
         with self._cluster_lock:
-            for cache_name, timeout in cache_timeouts.items():
-                cache = self._cluster_caches.get(cache_name)
+            for cache_name, cache in self._cluster_caches.items():
                 if not cache:
                     continue
-                expired_keys = [cluster_key for cluster_key, sensor_cluster in cache.items() if sensor_cluster.age > timeout]
+                timeout = self._get_cluster_cache_timeout(cache_name)
+                if timeout is None:
+                    continue
+
+                # Clusters are inserted when created, so every cache is ordered
+                # by age and the sweep can stop at the first cluster that is
+                # still fresh instead of visiting the whole cache.
+                expired_keys = []
+                for cluster_key, sensor_cluster in cache.items():
+                    if sensor_cluster.age <= timeout:
+                        break
+                    expired_keys.append(cluster_key)
                 for cluster_key in expired_keys:
                     expired.append((cache_name, cluster_key, cache.pop(cluster_key)))
 
@@ -448,14 +514,8 @@ class Pool(ABC):
         if not values:
             raise ValueError(f"{what}: no boards in pool")
 
-        def canonical(value):
-            if isinstance(value, (dict, list)):
-                return json.dumps(value, sort_keys=True, separators=(",", ":"))
-            return value
-
-        reference = canonical(values[0])
         for index, value in enumerate(values[1:], start=1):
-            if canonical(value) != reference:
+            if _board_values_differ(value, values[0]):
                 raise ValueError(f"{what}: mismatch between boards (board 0 != board {index})")
 
     def _reconcile_across_boards(
@@ -471,15 +531,13 @@ class Pool(ABC):
         if not values:
             raise ValueError(f"{what}: no boards in pool")
 
-        def canonical(value):
+        def relevant(value):
             if ignore_keys and isinstance(value, dict):
-                value = {key: item for key, item in value.items() if key not in ignore_keys}
-            if isinstance(value, (dict, list)):
-                return json.dumps(value, sort_keys=True, separators=(",", ":"))
+                return {key: item for key, item in value.items() if key not in ignore_keys}
             return value
 
-        reference = canonical(values[0])
-        mismatched = [index for index, value in enumerate(values[1:], start=1) if canonical(value) != reference]
+        reference = relevant(values[0])
+        mismatched = [index for index, value in enumerate(values[1:], start=1) if _board_values_differ(relevant(value), reference)]
         if not mismatched:
             return values[0]
 
@@ -537,13 +595,23 @@ class Pool(ABC):
 
         return None
 
+    def _get_cluster_cache_size_limit(self, cache_name: str) -> int | None:
+        """Return the maximum number of clusters in a cache, or ``None`` for no limit.
+
+        When a new cluster would exceed the limit, the oldest cluster is
+        evicted and handed to :meth:`_on_cluster_expired`, just like a cluster
+        that timed out.
+        """
+
+        return None
+
     def _on_cluster_expired(
         self,
         cache_name: str,
         cluster_key: Hashable,
         sensor_cluster: SensorCluster,
     ) -> None:
-        """A cluster timed out before completing and was evicted from its cache.
+        """A cluster timed out (or was displaced from a full cache) before completing and was evicted.
 
         The default silently discards stale incomplete measurements. A
         subclass whose consumers also want partial measurements (every sensor
@@ -15,6 +15,7 @@ diagnose radar schedules.
 """
 
 import binascii
+import struct
 
 from .sensor import RFSwitchState
 from .wifi import SequenceControl
@@ -35,6 +36,9 @@ RADAR_TX_REPORT_TLV_TYPE_CRC32 = 255
 
 RADAR_TX_REPORT_FLAG_HAS_HW_TIMESTAMP = 1 << 0
 
+_TYPE_HEADER = struct.Struct("<I")
+_TLV_LENGTH = struct.Struct("<H")
+
 
 class RadarTxReportPacket:
     def __init__(self, buf=None):
@@ -43,13 +47,13 @@ class RadarTxReportPacket:
             raise ValueError("Radar TX report TLV packet too short")
 
         self._raw = raw
-        self.type_header = int.from_bytes(raw[0:4], byteorder="little")
+        self.type_header = _TYPE_HEADER.unpack_from(raw)[0]
         if self.type_header != RADAR_TX_REPORT_TYPE_HEADER:
             raise ValueError("Unexpected radar TX report type header")
 
         self.source_mac = bytes(6)
         self.destination_mac = bytes(6)
-        self.sequence_control = SequenceControl(b"\x00\x00")
+        self.sequence_control = SequenceControl.from_buffer_copy(b"\x00\x00")
         self.frame_len = 0
         self.software_enqueue_timestamp_us = 0
         self.tx_count = 0
@@ -75,7 +79,7 @@ class RadarTxReportPacket:
                 raise ValueError("Malformed radar TX report TLV header")
 
             tlv_type = raw[offset]
-            tlv_len = int.from_bytes(raw[offset + 1 : offset + 3], byteorder="little")
+            tlv_len = _TLV_LENGTH.unpack_from(raw, offset + 1)[0]
             tlv_start = offset
             offset += 3
             tlv_end = offset + tlv_len
@@ -89,7 +93,7 @@ class RadarTxReportPacket:
                     raise ValueError("Invalid radar TX report frame meta TLV")
                 self.source_mac = bytes(value[0:6])
                 self.destination_mac = bytes(value[6:12])
-                self.sequence_control = SequenceControl(value[12:14])
+                self.sequence_control = SequenceControl.from_buffer_copy(value, 12)
                 self.frame_len = int.from_bytes(value[14:16], byteorder="little")
             elif tlv_type == RADAR_TX_REPORT_TLV_TYPE_TIMING_META:
                 if tlv_len < 8:
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
 import numpy as np
+import functools
 from abc import ABC, abstractmethod
 
 from . import constants
@@ -15,12 +16,17 @@ class BoardRevision(ABC):
     def identification(self) -> tuple:
         """Return the controller identification tuple for this revision."""
 
-    @property
-    def calib_trace_delays(self) -> list:
-        """Calibration trace signal delays on ESPARGOS PCB [in s]"""
+    @functools.cached_property
+    def calib_trace_delays(self) -> np.ndarray:
+        """Calibration trace signal delays on ESPARGOS PCB [in s]
+
+        The array is computed once and shared read-only; copy it before modifying.
+        """
         effective_dielectric_constant = (self._calib_trace_dielectric_constant + 1) / 2 + (self._calib_trace_dielectric_constant - 1) / 2 * (1 + 12 * (self._calib_trace_height / self._calib_trace_width)) ** (-1 / 2)
         group_velocity = constants.SPEED_OF_LIGHT / effective_dielectric_constant**0.5
-        return self._calib_trace_lengths / group_velocity
+        delays = self._calib_trace_lengths / group_velocity
+        delays.setflags(write=False)
+        return delays
 
     @abstractmethod
     def esp_num_to_row_col(self, esp_num: int) -> tuple:
@@ -28,7 +34,18 @@ class BoardRevision(ABC):
 
     def antenna_id_to_row_col(self, antenna_id: int) -> tuple:
         """Convert firmware antenna id to (row, column) on this board revision."""
-        return self.esp_num_to_row_col(self._antenna_id_to_esp_num[antenna_id])
+        return self._antenna_id_to_row_col[antenna_id]
+
+    @functools.cached_property
+    def _antenna_id_to_row_col(self) -> tuple:
+        """(row, column) indexed by firmware antenna ID, derived once from the revision's ESP mapping."""
+        return tuple(self.esp_num_to_row_col(esp_num) for esp_num in self._antenna_id_to_esp_num)
+
+    @functools.cached_property
+    def _antenna_id_rows_cols(self) -> tuple[np.ndarray, np.ndarray]:
+        """Row and column index arrays, indexed by firmware antenna ID, for gathering board-local arrays."""
+        rows, cols = np.asarray(self._antenna_id_to_row_col).T
+        return rows, cols
 
     def sensor_values_to_antenna_id_list(self, values, name: str = "values") -> list:
         """Convert a board-local (row, column) array to firmware antenna-id order."""
@@ -37,17 +54,14 @@ class BoardRevision(ABC):
         if array.shape != expected_shape:
             raise ValueError(f"{name} must use (row, column) shape {expected_shape}, got {array.shape}")
 
-        values_by_antenna_id = []
-        for antenna_id in range(constants.ANTENNAS_PER_BOARD):
-            row, col = self.antenna_id_to_row_col(antenna_id)
-            value = array[row, col]
-            values_by_antenna_id.append(value.item() if hasattr(value, "item") else value)
-        return values_by_antenna_id
+        # Gather all sensors in antenna-id order at once; tolist() yields native Python scalars
+        rows, cols = self._antenna_id_rows_cols
+        return array[rows, cols].tolist()
 
     @property
     @abstractmethod
-    def _antenna_id_to_esp_num(self) -> dict:
-        """Map firmware antenna IDs to ESP indices."""
+    def _antenna_id_to_esp_num(self) -> tuple:
+        """ESP indices, indexed by firmware antenna ID."""
 
     # Private, (potentially) revision-specific properties
     @property
@@ -73,49 +87,40 @@ class BoardRevision(ABC):
 
 # Codename "ESPARGOS-DENSIFLORUS" (2025/2026 PCB)
 class BoardRevisionDensiflorus(BoardRevision):
-    @property
-    def identification(self) -> tuple:
-        return ("espargos", "densiflorus")
+    identification = ("espargos", "densiflorus")
 
-    def esp_num_to_row_col(self, esp_num: int) -> tuple:
-        row = 1 - esp_num // 4
-        col = 3 - esp_num % 4
-        return (row, col)
-
-    @property
-    def _antenna_id_to_esp_num(self) -> dict:
-        return {
-            0: 3,  # Sensor 0 -> ESP 0
-            1: 2,  # Sensor 1 -> ESP 1
-            2: 1,  # Sensor 2 -> ESP 2
-            3: 0,  # Sensor 3 -> ESP 3
-            4: 7,  # Sensor 4 -> ESP 4
-            5: 6,  # Sensor 5 -> ESP 5
-            6: 5,  # Sensor 6 -> ESP 6
-            7: 4,  # Sensor 7 -> ESP 7
-        }
+    # ESP n sits in row 1 - n // 4, column 3 - n % 4
+    _ESP_NUM_TO_ROW_COL = tuple((1 - esp_num // 4, 3 - esp_num % 4) for esp_num in range(constants.ANTENNAS_PER_BOARD))
 
-    # Private, (potentially) revision-specific properties
-    @property
-    def _calib_trace_dielectric_constant(self) -> float:
-        return 4.3
-
-    @property
-    def _calib_trace_lengths(self) -> list:
-        return np.asarray(
-            [
-                [0.0604561, 0.0373554, 0.1070395, 0.1770280],
-                [0.1076842, 0.0554654, 0.0806678, 0.1462569],
-            ]
-        )
-
-    @property
-    def _calib_trace_width(self) -> float:
-        return 0.2
-
-    @property
-    def _calib_trace_height(self) -> float:
-        return 0.119
+    def esp_num_to_row_col(self, esp_num: int) -> tuple:
+        return self._ESP_NUM_TO_ROW_COL[esp_num]
+
+    # Indexed by firmware antenna ID
+    _antenna_id_to_esp_num = (
+        3,  # Sensor 0 -> ESP 0
+        2,  # Sensor 1 -> ESP 1
+        1,  # Sensor 2 -> ESP 2
+        0,  # Sensor 3 -> ESP 3
+        7,  # Sensor 4 -> ESP 4
+        6,  # Sensor 5 -> ESP 5
+        5,  # Sensor 6 -> ESP 6
+        4,  # Sensor 7 -> ESP 7
+    )
+
+    # Private, (potentially) revision-specific constants
+    _calib_trace_dielectric_constant = 4.3
+    _calib_trace_lengths = np.asarray(
+        [
+            [0.0604561, 0.0373554, 0.1070395, 0.1770280],
+            [0.1076842, 0.0554654, 0.0806678, 0.1462569],
+        ],
+        dtype=np.float64,
+    )
+    # Shared by all instances of this revision
+    _calib_trace_lengths.setflags(write=False)
+    _calib_trace_width = 0.2
+    _calib_trace_height = 0.119
 
 
 _ALL_REVISIONS = (BoardRevisionDensiflorus(),)
+_REVISIONS_BY_IDENTIFICATION = {rev.identification: rev for rev in _ALL_REVISIONS}
@@ -51,6 +51,7 @@ Terminology:
 from __future__ import annotations
 
 import ctypes
+import struct
 import time
 from dataclasses import dataclass, replace
 from enum import IntEnum
@@ -74,6 +75,8 @@ SENSOR_PACKET_TERMINATOR_UID = 0
 SENSOR_UID_ANTENNA_SHIFT = 29
 SENSOR_UID_ANTENNA_MASK = 0x7
 
+_TYPE_HEADER = struct.Struct("<I")
+
 
 class RFSwitchState(IntEnum):
     SENSOR_RFSWITCH_ISOLATION = 0
@@ -143,14 +146,15 @@ class SensorPacket:
         raw = bytes(data)
         if len(raw) < 4:
             raise ValueError("Sensor packet too short")
-        if int.from_bytes(raw[:4], byteorder="little") != SENSOR_PACKET_TYPE_HEADER:
+        if _TYPE_HEADER.unpack_from(raw)[0] != SENSOR_PACKET_TYPE_HEADER:
             raise ValueError("Invalid sensor packet type header")
 
         fragments = []
         offset = 4
         header_size = ctypes.sizeof(SensorFragmentHeader)
         while offset + header_size <= len(raw):
-            header = SensorFragmentHeader(raw[offset : offset + header_size])
+            # Decode the header straight from the packet buffer instead of slicing it out first
+            header = SensorFragmentHeader.from_buffer_copy(raw, offset)
             offset += header_size
             if header.uid == SENSOR_PACKET_TERMINATOR_UID:
                 packet = cls(tuple(fragments))
@@ -267,7 +271,7 @@ def get_sensor_message_type_header(message: SensorMessage[bytes]) -> int:
     """Return the four-byte logical type header of a reassembled message."""
     if len(message.payload) < 4:
         raise ValueError("Sensor message too short")
-    return int.from_bytes(message.payload[:4], byteorder="little")
+    return _TYPE_HEADER.unpack_from(message.payload)[0]
 
 
 def decode_sensor_message(
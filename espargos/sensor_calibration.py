@@ -64,18 +64,12 @@ def compute_reference_path_delays(boards: list, board_cable_lengths=None, board_
         board_cable_vfs = np.asarray(board_cable_vfs, dtype=np.float64)
         cable_group_delays[:] = board_cable_lengths / (constants.SPEED_OF_LIGHT * board_cable_vfs)
 
-    reference_path_delays = np.zeros(
-        (
-            len(boards),
-            constants.ROWS_PER_BOARD,
-            constants.ANTENNAS_PER_ROW,
-        ),
-        dtype=np.float64,
+    trace_delays = np.asarray([board_obj.revision.calib_trace_delays for board_obj in boards], dtype=np.float64).reshape(
+        len(boards),
+        constants.ROWS_PER_BOARD,
+        constants.ANTENNAS_PER_ROW,
     )
-    for board_index, board_obj in enumerate(boards):
-        reference_path_delays[board_index, :, :] = cable_group_delays[board_index] + board_obj.revision.calib_trace_delays
-
-    return reference_path_delays
+    return cable_group_delays[:, np.newaxis, np.newaxis] + trace_delays
 
 
 class SensorCalibration:
@@ -130,7 +124,7 @@ class SensorCalibration:
         self.phase_reference_frequency = float(phase_reference_frequency)
         self.timing_offsets = np.asarray(timing_offsets, dtype=np.float64)
         # Wrap to (-pi, pi] for readability; only the principal value matters
-        self.phase_offsets = np.angle(np.exp(1.0j * np.asarray(phase_offsets, dtype=np.float64)))
+        self.phase_offsets = np.pi - np.mod(np.pi - np.asarray(phase_offsets, dtype=np.float64), 2.0 * np.pi)
         self.clock_scope = ClockReferenceScope(clock_scope)
         self.reference_path_delays = np.zeros(self.sensor_shape) if reference_path_delays is None else np.asarray(reference_path_delays, dtype=np.float64)
 
@@ -151,13 +145,31 @@ class SensorCalibration:
             phase and time offsets.
         """
         frequencies = np.asarray(frequencies, dtype=np.float64)
-        relative_frequencies = frequencies - self.phase_reference_frequency
-        response_phase = self.phase_offsets[..., np.newaxis] - 2.0 * np.pi * relative_frequencies[np.newaxis, np.newaxis, np.newaxis, :] * self.timing_offsets[..., np.newaxis]
-        # The measured offsets include the reference-path-only delays, which
-        # measurement data does not experience; compensate them at the absolute
-        # frequencies so the result is independent of the reference convention.
-        correction_phase = response_phase + 2.0 * np.pi * self.reference_path_delays[..., np.newaxis] * frequencies[np.newaxis, np.newaxis, np.newaxis, :]
-        return np.exp(-1.0j * correction_phase).astype(np.complex64)
+        # The correction phase is the response phase plus the reference-path-only
+        # delays, which measurement data does not experience; they are compensated
+        # at the absolute frequencies so the result is independent of the reference
+        # convention. Per sensor, this is affine in frequency:
+        #   phase_offset - 2 * pi * (f - f_ref) * timing_offset + 2 * pi * f * reference_path_delay
+        #   = (phase_offset + 2 * pi * f_ref * timing_offset) + 2 * pi * (reference_path_delay - timing_offset) * f
+        # so it is evaluated as one outer product into a single buffer.
+        phase_intercept = self.phase_offsets + 2.0 * np.pi * self.phase_reference_frequency * self.timing_offsets
+        phase_slope = 2.0 * np.pi * (self.reference_path_delays - self.timing_offsets)
+        correction_phase = np.multiply.outer(phase_slope, frequencies)
+        correction_phase += phase_intercept[..., np.newaxis]
+
+        # The absolute-frequency terms reach hundreds of radians, so the phase is formed
+        # in float64 and reduced to [-pi, pi]; the reduced phase keeps ~1e-7 rad precision
+        # in float32, which is all the unit-modulus complex64 result can represent anyway.
+        correction_phase -= 2.0 * np.pi * np.rint(correction_phase / (2.0 * np.pi))
+        correction_phase = correction_phase.astype(np.float32)
+
+        # Write the real and imaginary parts of exp(-j * phase) directly instead of going
+        # through a complex128 temporary.
+        correction = np.empty(correction_phase.shape, dtype=np.complex64)
+        np.cos(correction_phase, out=correction.real)
+        np.sin(correction_phase, out=correction.imag)
+        np.negative(correction.imag, out=correction.imag)
+        return correction
 
     def time_to_sensor_time(self, time):
         """
@@ -44,7 +44,11 @@ class SensorCluster(ABC):
             constants.ANTENNAS_PER_ROW,
         )
         self._completion = np.full(self._shape, False, dtype=np.bool_)
+        # Number of completed positions, so that completeness checks need not scan the array
+        self._completion_count = 0
         self._created_at = time.monotonic()
+        # Pool callbacks that have already fired for this cluster, see Pool.add_cluster_callback
+        self._fired_callbacks = set()
 
     @property
     def shape(self) -> tuple[int, int, int]:
@@ -68,7 +72,7 @@ class SensorCluster(ABC):
     def is_complete(self) -> bool:
         """Return whether every sensor supplied its part of the measurement."""
 
-        return bool(np.all(self._completion))
+        return self._completion_count == self._completion.size
 
     @property
     def age(self) -> float:
@@ -87,7 +91,9 @@ class SensorCluster(ABC):
     ) -> None:
         """Mark an already resolved logical sensor position as complete."""
 
-        self._completion[sensor_position] = True
+        if not self._completion[sensor_position]:
+            self._completion[sensor_position] = True
+            self._completion_count += 1
 
     @abstractmethod
     def add_message(self, board_index: int, sensor_message: sensor.SensorMessage) -> bool:
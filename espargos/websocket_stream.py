@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+"""
+Minimal receive-side WebSocket client for the controller's sensor stream.
+
+The sensor stream WebSocket only carries binary frames from the controller to
+the host. Instead of running every frame through a general-purpose WebSocket
+library, this module performs the opening handshake itself and then parses the
+RFC 6455 frame headers inline while receiving directly into one reused buffer.
+Received payloads are returned as memoryviews into that buffer, so a frame
+is never copied before the consumer decides to keep it.
+"""
+
+import urllib.parse
+import hashlib
+import base64
+import socket
+import struct
+import os
+
+__all__ = [
+    "WebSocketProtocolError",
+    "WebSocketStream",
+]
+
+WEBSOCKET_ACCEPT_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+WEBSOCKET_DEFAULT_PORT = 80
+WEBSOCKET_MAX_HANDSHAKE_SIZE = 16 * 1024
+WEBSOCKET_RECV_BUFFER_SIZE = 256 * 1024
+
+OPCODE_CONTINUATION = 0x0
+OPCODE_TEXT = 0x1
+OPCODE_BINARY = 0x2
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+_UINT16 = struct.Struct("!H")
+_UINT64 = struct.Struct("!Q")
+
+
+class WebSocketProtocolError(Exception):
+    "Raised when the WebSocket server violates the protocol or closes the connection."
+
+    pass
+
+
+class WebSocketStream:
+    def __init__(self, host: str, path: str, open_timeout: float = 3):
+        """
+        Connect to a WebSocket endpoint and perform the opening handshake.
+
+        :param host: Hostname or IP address of the server, optionally with a port
+        :param path: Request path of the WebSocket endpoint, without leading slash
+        :param open_timeout: Timeout for establishing the connection and handshake, in seconds
+
+        :raises TimeoutError: If the connection or handshake times out
+        :raises WebSocketProtocolError: If the server rejects the WebSocket upgrade
+        """
+        url = urllib.parse.urlsplit(f"ws://{host}/")
+        self._sock = socket.create_connection((url.hostname, url.port or WEBSOCKET_DEFAULT_PORT), timeout=open_timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        self._buffer = bytearray(WEBSOCKET_RECV_BUFFER_SIZE)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+        self._fragments = None
+
+        try:
+            self._handshake(url.netloc, path)
+        except BaseException:
+            self._sock.close()
+            raise
+
+    def _handshake(self, netloc: str, path: str):
+        key = base64.b64encode(os.urandom(16))
+        request = f"GET /{path} HTTP/1.1\r\nHost: {netloc}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Key: {key.decode('ascii')}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+        self._sock.sendall(request.encode("ascii"))
+
+        header_end = -1
+        while header_end < 0:
+            if self._end >= WEBSOCKET_MAX_HANDSHAKE_SIZE:
+                raise WebSocketProtocolError("WebSocket handshake response too large")
+            self._fill()
+            header_end = self._buffer.find(b"\r\n\r\n", 0, self._end)
+
+        status_line, *header_lines = bytes(self._view[:header_end]).decode("latin-1").split("\r\n")
+        status_fields = status_line.split(" ", 2)
+        if len(status_fields) < 2 or status_fields[1] != "101":
+            raise WebSocketProtocolError(f"Server rejected WebSocket upgrade: {status_line}")
+
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        expected_accept = base64.b64encode(hashlib.sha1(key + WEBSOCKET_ACCEPT_GUID).digest()).decode("ascii")
+        if headers.get("sec-websocket-accept") != expected_accept:
+            raise WebSocketProtocolError("Server sent an invalid Sec-WebSocket-Accept header")
+
+        # Any bytes following the handshake response already belong to the first frames
+        self._start = header_end + 4
+
+    def _fill(self):
+        """Receive more data into the buffer, compacting or growing it as needed."""
+        if self._end == len(self._buffer):
+            pending = self._end - self._start
+            if self._start == 0:
+                grown = bytearray(2 * len(self._buffer))
+                grown[:pending] = self._view[:pending]
+                self._buffer = grown
+                self._view = memoryview(self._buffer)
+            else:
+                self._view[:pending] = bytes(self._view[self._start : self._end])
+            self._start = 0
+            self._end = pending
+
+        received = self._sock.recv_into(self._view[self._end :])
+        if received == 0:
+            raise WebSocketProtocolError("WebSocket connection closed by server")
+        self._end += received
+
+    def _require(self, size: int):
+        while self._end - self._start < size:
+            self._fill()
+
+    def _send_frame(self, opcode: int, payload: bytes = b""):
+        # Client-to-server frames must be masked; only short control frames are ever sent
+        mask = os.urandom(4)
+        masked = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+        self._sock.sendall(bytes([0x80 | opcode, 0x80 | len(payload)]) + mask + masked)
+
+    def recv(self, timeout: float) -> memoryview:
+        """
+        Receive the next complete data message.
+
+        The returned memoryview points into the receive buffer and is only valid
+        until the next call to :meth:`recv`. Control frames are handled internally.
+
+        :param timeout: Maximum time to wait for more data, in seconds
+
+        :raises TimeoutError: If no complete message arrives within the timeout
+        :raises WebSocketProtocolError: If the server closes the connection or sends a malformed frame
+        """
+        self._sock.settimeout(timeout)
+        while True:
+            if self._start == self._end:
+                self._start = self._end = 0
+            self._require(2)
+            first, second = self._buffer[self._start], self._buffer[self._start + 1]
+            if second & 0x80:
+                raise WebSocketProtocolError("Server sent a masked frame")
+
+            header_size = 2
+            payload_size = second & 0x7F
+            if payload_size == 126:
+                header_size = 4
+                self._require(header_size)
+                payload_size = _UINT16.unpack_from(self._buffer, self._start + 2)[0]
+            elif payload_size == 127:
+                header_size = 10
+                self._require(header_size)
+                payload_size = _UINT64.unpack_from(self._buffer, self._start + 2)[0]
+
+            self._require(header_size + payload_size)
+            payload_start = self._start + header_size
+            self._start = payload_start + payload_size
+            payload = self._view[payload_start : self._start]
+
+            fin = first & 0x80
+            opcode = first & 0x0F
+            if opcode in (OPCODE_BINARY, OPCODE_TEXT):
+                if fin:
+                    return payload
+                self._fragments = bytearray(payload)
+            elif opcode == OPCODE_CONTINUATION:
+                if self._fragments is None:
+                    raise WebSocketProtocolError("Unexpected WebSocket continuation frame")
+                self._fragments += payload
+                if fin:
+                    message = memoryview(self._fragments)
+                    self._fragments = None
+                    return message
+            elif opcode == OPCODE_PING:
+                self._send_frame(OPCODE_PONG, bytes(payload))
+            elif opcode == OPCODE_CLOSE:
+                raise WebSocketProtocolError("WebSocket connection closed by server")
+            elif opcode != OPCODE_PONG:
+                raise WebSocketProtocolError(f"Unknown WebSocket opcode {opcode}")
+
+    def close(self):
+        """Send a close frame (best-effort) and close the connection."""
+        try:
+            self._send_frame(OPCODE_CLOSE)
+        except OSError:
+            pass
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+"""
+Tests for the cross-board value comparison in :mod:`espargos.pool`.
+
+Run with ``python -m unittest discover -s tests``.
+"""
+
+import unittest
+
+from espargos.pool import _board_values_differ
+
+
+class BoardValuesDifferTest(unittest.TestCase):
+    def test_equal_values(self):
+        for value in ({"x": 1, "y": [1.5, True, None, "a"]}, [{"a": {"b": [1, 2]}}], {}, [], 3, "on"):
+            with self.subTest(value=value):
+                self.assertFalse(_board_values_differ(value, value))
+
+    def test_dict_key_order_is_ignored(self):
+        self.assertFalse(_board_values_differ({"a": 1, "b": 2}, {"b": 2, "a": 1}))
+
+    def test_json_encoding_differences_are_tolerated(self):
+        # Integer and string keys encode to the same JSON object
+        self.assertFalse(_board_values_differ({1: "x"}, {"1": "x"}))
+
+    def test_json_type_mismatches_are_reported(self):
+        cases = [
+            ({"x": True}, {"x": 1}),
+            ({"x": 1}, {"x": 1.0}),
+            ({"x": False}, {"x": 0.0}),
+            ([True], [1]),
+            ([1], [1.0]),
+            ({"x": {"y": [1]}}, {"x": {"y": [1.0]}}),
+        ]
+        for value, reference in cases:
+            with self.subTest(value=value, reference=reference):
+                self.assertTrue(_board_values_differ(value, reference))
+                self.assertTrue(_board_values_differ(reference, value))
+
+    def test_different_values_are_reported(self):
+        self.assertTrue(_board_values_differ({"x": 1}, {"x": 2}))
+        self.assertTrue(_board_values_differ({"x": 1}, {"x": 1, "y": 2}))
+        self.assertTrue(_board_values_differ([1, 2], [2, 1]))
+        self.assertTrue(_board_values_differ({"x": 1}, [1]))
+        self.assertTrue(_board_values_differ(1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+"""
+Tests for the receive-side WebSocket client in :mod:`espargos.websocket_stream`.
+
+Each test connects the client to one end of a local TCP socket pair and plays
+the controller on the other end from a thread: it answers the opening
+handshake and then writes crafted RFC 6455 frames. Frames sent by the client
+(pong, close) are collected and unmasked for inspection.
+
+Run with ``python -m unittest discover -s tests``.
+"""
+
+import unittest.mock
+import threading
+import unittest
+import hashlib
+import base64
+import socket
+import struct
+
+from espargos import websocket_stream
+from espargos.websocket_stream import WebSocketProtocolError, WebSocketStream
+
+TIMEOUT = 5
+
+
+def _tcp_socketpair() -> tuple[socket.socket, socket.socket]:
+    # socket.socketpair() yields AF_UNIX sockets on Linux, which reject TCP_NODELAY
+    with socket.create_server(("127.0.0.1", 0)) as listener:
+        client = socket.create_connection(listener.getsockname())
+        server, _ = listener.accept()
+    return client, server
+
+
+def frame(opcode: int, payload: bytes = b"", fin: bool = True) -> bytes:
+    """Encode one unmasked server-to-client frame, choosing the shortest length encoding."""
+    first = (0x80 if fin else 0x00) | opcode
+    if len(payload) < 126:
+        header = bytes([first, len(payload)])
+    elif len(payload) < 1 << 16:
+        header = bytes([first, 126]) + struct.pack("!H", len(payload))
+    else:
+        header = bytes([first, 127]) + struct.pack("!Q", len(payload))
+    return header + payload
+
+
+def parse_client_frames(data: bytes) -> list[tuple[int, bytes]]:
+    """Decode masked client-to-server frames into (opcode, payload) pairs."""
+    frames = []
+    while data:
+        opcode = data[0] & 0x0F
+        assert data[1] & 0x80, "client frames must be masked"
+        size = data[1] & 0x7F
+        mask = data[2:6]
+        payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(data[6 : 6 + size]))
+        frames.append((opcode, payload))
+        data = data[6 + size :]
+    return frames
+
+
+class FakeController:
+    """Plays the server side of one WebSocket connection from a background thread."""
+
+    def __init__(self, sock: socket.socket, frames: bytes = b"", accept: str | None = None, status: str = "101 Switching Protocols"):
+        self.sock = sock
+        self.frames = frames
+        self.accept = accept
+        self.status = status
+        self.request = b""
+        self.received = b""
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        while b"\r\n\r\n" not in self.request:
+            self.request += self.sock.recv(4096)
+
+        key = next(line.split(b":", 1)[1].strip() for line in self.request.split(b"\r\n") if line.lower().startswith(b"sec-websocket-key:"))
+        accept = self.accept if self.accept is not None else base64.b64encode(hashlib.sha1(key + websocket_stream.WEBSOCKET_ACCEPT_GUID).digest()).decode("ascii")
+        response = f"HTTP/1.1 {self.status}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Accept: {accept}\r\n\r\n"
+        self.sock.sendall(response.encode("ascii") + self.frames)
+
+        while chunk := self.sock.recv(4096):
+            self.received += chunk
+
+    def client_frames(self) -> list[tuple[int, bytes]]:
+        self.thread.join(TIMEOUT)
+        return parse_client_frames(self.received)
+
+
+class WebSocketStreamTest(unittest.TestCase):
+    def connect(self, frames: bytes = b"", **kwargs) -> tuple[WebSocketStream, FakeController]:
+        client, server = _tcp_socketpair()
+        self.addCleanup(server.close)
+        controller = FakeController(server, frames, **kwargs)
+        with unittest.mock.patch.object(websocket_stream.socket, "create_connection", return_value=client):
+            stream = WebSocketStream("controller.local", "api/stream", open_timeout=TIMEOUT)
+        self.addCleanup(stream._sock.close)
+        return stream, controller
+
+    def test_handshake_request(self):
+        stream, controller = self.connect()
+        stream.close()
+        controller.client_frames()
+        self.assertTrue(controller.request.startswith(b"GET /api/stream HTTP/1.1\r\n"))
+        self.assertIn(b"\r\nHost: controller.local\r\n", controller.request)
+        self.assertIn(b"\r\nSec-WebSocket-Version: 13\r\n", controller.request)
+
+    def test_payload_length_encodings(self):
+        # 7-bit, 16-bit and 64-bit lengths, the last one larger than the initial receive buffer
+        payloads = [bytes(range(125)), bytes(i % 251 for i in range(126)), bytes(i % 253 for i in range(65535)), bytes(i % 255 for i in range(300 * 1024))]
+        stream, _ = self.connect(b"".join(frame(websocket_stream.OPCODE_BINARY, payload) for payload in payloads))
+        for payload in payloads:
+            self.assertEqual(bytes(stream.recv(TIMEOUT)), payload)
+
+    def test_empty_and_text_messages(self):
+        stream, _ = self.connect(frame(websocket_stream.OPCODE_BINARY) + frame(websocket_stream.OPCODE_TEXT, b"hello"))
+        self.assertEqual(bytes(stream.recv(TIMEOUT)), b"")
+        self.assertEqual(bytes(stream.recv(TIMEOUT)), b"hello")
+
+    def test_data_following_handshake_in_same_segment(self):
+        # The handshake response and the first frames arrive in one sendall
+        stream, _ = self.connect(frame(websocket_stream.OPCODE_BINARY, b"\x01\x02\x03"))
+        self.assertEqual(bytes(stream.recv(TIMEOUT)), b"\x01\x02\x03")
+
+    def test_continuation_frames(self):
+        frames = frame(websocket_stream.OPCODE_BINARY, b"abc", fin=False)
+        frames += frame(websocket_stream.OPCODE_CONTINUATION, b"x" * 200, fin=False)
+        frames += frame(websocket_stream.OPCODE_CONTINUATION, b"def")
+        frames += frame(websocket_stream.OPCODE_BINARY, b"next")
+        stream, _ = self.connect(frames)
+        self.assertEqual(bytes(stream.recv(TIMEOUT)), b"abc" + b"x" * 200 + b"def")
+        self.assertEqual(bytes(stream.recv(TIMEOUT)), b"next")
+
+    def test_ping_inside_fragmented_message(self):
+        frames = frame(websocket_stream.OPCODE_BINARY, b"first", fin=False)
+        frames += frame(websocket_stream.OPCODE_PING, b"are you there")
+        frames += frame(websocket_stream.OPCODE_CONTINUATION, b"-second")
+        stream, controller = self.connect(frames)
+        self.assertEqual(bytes(stream.recv(TIMEOUT)), b"first-second")
+        stream.close()
+        self.assertEqual(
+            controller.client_frames(),
+            [(websocket_stream.OPCODE_PONG, b"are you there"), (websocket_stream.OPCODE_CLOSE, b"")],
+        )
+
+    def test_pong_is_ignored(self):
+        stream, _ = self.connect(frame(websocket_stream.OPCODE_PONG, b"unsolicited") + frame(websocket_stream.OPCODE_BINARY, b"data"))
+        self.assertEqual(bytes(stream.recv(TIMEOUT)), b"data")
+
+    def test_close_frames(self):
+        for close_payload in (b"", struct.pack("!H", 1000), struct.pack("!H", 1001) + b"going away", struct.pack("!H", 1011)):
+            with self.subTest(close_payload=close_payload):
+                stream, _ = self.connect(frame(websocket_stream.OPCODE_BINARY, b"before") + frame(websocket_stream.OPCODE_CLOSE, close_payload))
+                self.assertEqual(bytes(stream.recv(TIMEOUT)), b"before")
+                with self.assertRaises(WebSocketProtocolError):
+                    stream.recv(TIMEOUT)
+
+    def test_connection_closed_without_close_frame(self):
+        client, server = _tcp_socketpair()
+        controller = FakeController(server, frame(websocket_stream.OPCODE_BINARY, b"x" * 10)[:-5])
+        with unittest.mock.patch.object(websocket_stream.socket, "create_connection", return_value=client):
+            stream = WebSocketStream("controller.local", "api/stream", open_timeout=TIMEOUT)
+        self.addCleanup(stream._sock.close)
+        server.shutdown(socket.SHUT_WR)
+        with self.assertRaises(WebSocketProtocolError):
+            stream.recv(TIMEOUT)
+        stream.close()
+        controller.thread.join(TIMEOUT)
+        server.close()
+
+    def test_bad_accept_key(self):
+        with self.assertRaises(WebSocketProtocolError):
+            self.connect(accept=base64.b64encode(b"\x00" * 20).decode("ascii"))
+
+    def test_rejected_upgrade(self):
+        with self.assertRaises(WebSocketProtocolError):
+            self.connect(status="404 Not Found")
+
+    def test_masked_server_frame(self):
+        masked = bytes([0x80 | websocket_stream.OPCODE_BINARY, 0x80 | 1]) + b"\x00\x00\x00\x00" + b"a"
+        stream, _ = self.connect(masked)
+        with self.assertRaises(WebSocketProtocolError):
+            stream.recv(TIMEOUT)
+
+    def test_unexpected_continuation(self):
+        stream, _ = self.connect(frame(websocket_stream.OPCODE_CONTINUATION, b"orphan"))
+        with self.assertRaises(WebSocketProtocolError):
+            stream.recv(TIMEOUT)
+
+    def test_unknown_opcode(self):
+        stream, _ = self.connect(frame(0x3, b"reserved"))
+        with self.assertRaises(WebSocketProtocolError):
+            stream.recv(TIMEOUT)
+
+    def test_recv_timeout(self):
+        stream, _ = self.connect()
+        with self.assertRaises(TimeoutError):
+            stream.recv(0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()